@@ -1,5 +1,18 @@
 import importlib.metadata
 
-from .pydantic_view import reapply_base_views, view, view_field_validator, view_model_validator
+from .pydantic_view import (
+    export_view_schemas,
+    get_view,
+    get_view_key,
+    iter_views,
+    reapply_base_views,
+    register_pregenerated_view,
+    select_cache_clear,
+    select_cache_info,
+    view,
+    view_field_validator,
+    view_model_validator,
+    views_of,
+)
 
 __version__ = importlib.metadata.version("pydantic_view")
@@ -0,0 +1,28 @@
+import argparse
+import sys
+
+from .codegen import generate_views_module
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pydantic_view")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compile_parser = commands.add_parser("compile", help="generate module with pregenerated views")
+    compile_parser.add_argument("modules", nargs="+", help="modules declaring views")
+    compile_parser.add_argument("-o", "--output", help="output file, stdout by default")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compile":
+        sys.path.insert(0, "")
+        source = generate_views_module(args.modules)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(source)
+        else:
+            sys.stdout.write(source)
+
+
+if __name__ == "__main__":
+    main()
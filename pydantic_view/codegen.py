@@ -0,0 +1,278 @@
+import dataclasses
+import enum
+import importlib
+import math
+import types
+import typing
+from collections.abc import Sequence
+
+from pydantic import BaseModel
+from pydantic.fields import FieldInfo
+from pydantic_core import PydanticUndefined
+
+from .pydantic_view import _view_declaration, _view_fingerprint, _view_members, iter_views
+
+
+class UnsupportedView(Exception):
+    pass
+
+
+def _is_importable(obj) -> bool:
+    module, qualname = getattr(obj, "__module__", None), getattr(obj, "__qualname__", None)
+    if module is None or qualname is None or "<" in qualname:
+        return False
+    try:
+        value = importlib.import_module(module)
+    except ImportError:
+        return False
+    for part in qualname.split("."):
+        value = getattr(value, part, None)
+    return value is obj
+
+
+class _Renderer:
+    def __init__(self, generated: dict):
+        self.generated = generated
+        self.modules: dict[str, str] = {"pydantic": "_pydantic", "pydantic_view": "_pydantic_view", "typing": "_typing"}
+        self.dependencies: set = set()
+
+    def module(self, name: str) -> str:
+        if name not in self.modules:
+            self.modules[name] = f"_m{len(self.modules) - 3}"
+        return self.modules[name]
+
+    def ref(self, obj) -> str:
+        if obj in self.generated:
+            self.dependencies.add(obj)
+            return self.generated[obj]
+        if isinstance(obj, type) and issubclass(obj, BaseModel) and hasattr(obj, "__pydantic_view_params__"):
+            raise UnsupportedView(f"depends on view {obj.__qualname__} that is not generated")
+        if not _is_importable(obj):
+            raise UnsupportedView(f"{obj!r} is not importable")
+        if obj.__module__ == "builtins":
+            return obj.__qualname__
+        return f"{self.module(obj.__module__)}.{obj.__qualname__}"
+
+    def type(self, tp) -> str:
+        if tp is None or tp is type(None):
+            return "None"
+        if tp is Ellipsis:
+            return "..."
+        if tp is typing.Any:
+            return "_typing.Any"
+        if isinstance(tp, list):
+            return f"[{', '.join(self.type(x) for x in tp)}]"
+        origin, args = typing.get_origin(tp), typing.get_args(tp)
+        if origin is typing.Annotated:
+            return f"_typing.Annotated[{', '.join([self.type(args[0]), *(self.value(x) for x in args[1:])])}]"
+        if origin in (typing.Union, types.UnionType):
+            return f"_typing.Union[{', '.join(self.type(x) for x in args)}]"
+        if origin is typing.Literal:
+            return f"_typing.Literal[{', '.join(self.value(x) for x in args)}]"
+        if origin is not None:
+            return f"{self.ref(origin)}[{', '.join(self.type(x) for x in args) if args else '()'}]"
+        if isinstance(tp, type):
+            return self.ref(tp)
+        raise UnsupportedView(f"unsupported type {tp!r}")
+
+    def value(self, value) -> str:
+        if value is None or isinstance(value, (bool, int, str, bytes)) and not isinstance(value, enum.Enum):
+            return repr(value)
+        if isinstance(value, float):
+            return repr(value) if math.isfinite(value) else f"float({str(value)!r})"
+        if isinstance(value, tuple):
+            return f"({''.join(f'{self.value(x)}, ' for x in value)})"
+        if isinstance(value, list):
+            return f"[{', '.join(self.value(x) for x in value)}]"
+        if isinstance(value, (set, frozenset)):
+            items = ", ".join(sorted(self.value(x) for x in value))
+            return f"{type(value).__name__}({{{items}}})" if value else f"{type(value).__name__}()"
+        if isinstance(value, dict):
+            return f"{{{', '.join(f'{self.value(k)}: {self.value(v)}' for k, v in value.items())}}}"
+        if isinstance(value, enum.Enum):
+            return f"{self.ref(type(value))}.{value.name}"
+        if isinstance(value, (type, types.FunctionType, types.BuiltinFunctionType)):
+            return self.ref(value)
+        if dataclasses.is_dataclass(value):
+            kwds = ", ".join(
+                f"{x.name}={self.value(getattr(value, x.name))}" for x in dataclasses.fields(value) if x.init
+            )
+            return f"{self.ref(type(value))}({kwds})"
+        raise UnsupportedView(f"unsupported value {value!r}")
+
+
+def _render_field(renderer: _Renderer, root_cls, k: str, field_info: FieldInfo, default_factories: dict) -> str:
+    root_field_info = root_cls.model_fields.get(k)
+    root_field_ref = f"{renderer.ref(root_cls)}.model_fields[{k!r}]"
+
+    def render_attr(attr, value):
+        try:
+            return renderer.value(value)
+        except UnsupportedView:
+            if root_field_info is not None and getattr(root_field_info, attr, None) is value:
+                return f"{root_field_ref}.{attr}"
+            raise
+
+    annotation = renderer.type(field_info.annotation)
+    if field_info.metadata:
+        if root_field_info is not None and root_field_info.metadata == field_info.metadata:
+            annotation = f"_typing.Annotated[{annotation}, *{root_field_ref}.metadata]"
+        else:
+            metadata = ", ".join(render_attr("metadata", x) for x in field_info.metadata)
+            annotation = f"_typing.Annotated[{annotation}, {metadata}]"
+
+    kwds = []
+    if k in default_factories:
+        kwds.append(f"default_factory={render_attr('default_factory', default_factories[k])}")
+    else:
+        if field_info.default is not PydanticUndefined:
+            kwds.append(f"default={render_attr('default', field_info.default)}")
+        if (factory := field_info.default_factory) is not None:
+            kwds.append(f"default_factory={render_attr('default_factory', factory)}")
+    for attr in field_info._attributes_set:  # pylint: disable=protected-access
+        if attr in {"annotation", "default", "default_factory"} or attr in FieldInfo.metadata_lookup:
+            continue
+        if getattr(field_info, attr) is None:
+            continue
+        kwds.append(f"{attr}={render_attr(attr, getattr(field_info, attr))}")
+
+    return f"    {k}: {annotation} = _pydantic.Field({', '.join(kwds)})"
+
+
+def _render_view(renderer: _Renderer, view_cls) -> str:
+    root_cls = view_cls.__pydantic_view_root_cls__
+    view_params = view_cls.__pydantic_view_params__
+
+    if len(view_cls.__bases__) != 1:
+        raise UnsupportedView("multiple base classes")
+    if root_cls.__pydantic_generic_metadata__["parameters"] or root_cls.__pydantic_generic_metadata__["args"]:
+        raise UnsupportedView("generic model")
+    if members := _view_members(_view_declaration(view_cls)):
+        raise UnsupportedView(f"declares {', '.join(members)}")
+    if view_cls.__private_attributes__.keys() != root_cls.__private_attributes__.keys():
+        raise UnsupportedView("declares private attributes")
+    if (
+        view_cls.__pydantic_decorators__.computed_fields.keys()
+        != root_cls.__pydantic_decorators__.computed_fields.keys()
+    ):
+        raise UnsupportedView("declares computed fields")
+
+    config = {k: v for k, v in view_cls.model_config.items() if root_cls.model_config.get(k) != v}
+    config["defer_build"] = True
+
+    lines = [
+        f"class {renderer.generated[view_cls]}({renderer.ref(view_cls.__bases__[0])}):",
+        f"    model_config = _pydantic.ConfigDict({', '.join(f'{k}={renderer.value(v)}' for k, v in config.items())})",
+        "",
+    ]
+    default_factories = view_cls.__dict__.get("__pydantic_view_default_factories__", {})
+    for k, field_info in view_cls.model_fields.items():
+        lines.append(_render_field(renderer, root_cls, k, field_info, default_factories))
+
+    for k in sorted(view_cls.__pydantic_view_validators__):
+        v = root_cls.__dict__[k]
+        if (info := getattr(v, "__pydantic_view_field_validator__", None)) is not None:
+            args = ", ".join([*(renderer.value(x) for x in info["args"]), f"**{renderer.value(info['kwds'])}"])
+            lines.append(f"    {k} = _pydantic.field_validator({args})({renderer.ref(root_cls)}.__dict__[{k!r}])")
+        else:
+            info = v.__pydantic_view_model_validator__
+            kwds = renderer.value(info["kwds"])
+            lines.append(f"    {k} = _pydantic.model_validator(**{kwds})({renderer.ref(root_cls)}.__dict__[{k!r}])")
+
+    recursive_views = view_cls.__pydantic_view_recursive_views__
+    dependencies = sorted(renderer.generated[x] for x in renderer.dependencies if x is not view_cls)
+    lines += [
+        "",
+        "",
+        "_pydantic_view.register_pregenerated_view(",
+        f"    {renderer.generated[view_cls]},",
+        f"    {renderer.ref(root_cls)},",
+        f"    {view_params['name']!r},",
+        f"    fingerprint={_view_fingerprint(root_cls, _view_declaration(view_cls), view_params)!r},",
+        f"    fields={list(view_cls.model_fields)!r},",
+        f"    recursive_views={list(recursive_views) if recursive_views is not None else None!r},",
+        f"    validators={sorted(view_cls.__pydantic_view_validators__)!r},",
+        f"    dependencies=[{', '.join(dependencies)}],",
+        ")",
+    ]
+    return "\n".join(lines)
+
+
+def generate_views_module(modules: Sequence[str]) -> str:
+    """
+    Generate source of the module with pregenerated views of the models declared in the modules.
+
+    Views that can't be generated, e.g. views declaring methods or validators, are listed
+    in the module comments and built at runtime.
+
+    Args:
+      modules: names of the modules to import.
+    """
+
+    for module in modules:
+        importlib.import_module(module)
+
+    views = [
+        view_cls
+        for root_cls, _, view_cls in iter_views()
+        if _view_declaration(view_cls).__module__ in modules
+        and view_cls.__pydantic_view_root_cls__ is root_cls
+        and "__pydantic_view_params__" in view_cls.__dict__
+        and _is_importable(view_cls)
+    ]
+
+    generated = {}
+    for view_cls in views:
+        if (name := _view_declaration(view_cls).__name__) not in generated.values():
+            generated[view_cls] = name
+
+    skipped = {}
+    while True:
+        renderer = _Renderer(generated)
+        sources = {}
+        dependencies = {}
+        for view_cls in generated:
+            renderer.dependencies = set()
+            try:
+                sources[view_cls] = _render_view(renderer, view_cls)
+            except UnsupportedView as e:
+                skipped[view_cls] = f"{e}"
+            dependencies[view_cls] = renderer.dependencies - {view_cls}
+        for view_cls in generated:
+            if view_cls not in skipped and (module := _view_declaration(view_cls).__module__) in renderer.modules:
+                skipped[view_cls] = f"declared in {module} imported by the generated module"
+        if not skipped.keys() & generated.keys():
+            ordered = []
+            visiting = []
+
+            def visit(view_cls):
+                if view_cls in visiting:
+                    for x in visiting[visiting.index(view_cls) :]:
+                        skipped[x] = "recursive view"
+                if view_cls in ordered or view_cls in visiting:
+                    return
+                visiting.append(view_cls)
+                for dependency in dependencies[view_cls]:
+                    visit(dependency)
+                visiting.pop()
+                ordered.append(view_cls)
+
+            for view_cls in generated:
+                visit(view_cls)
+
+            if not skipped.keys() & generated.keys():
+                break
+        generated = {k: v for k, v in generated.items() if k not in skipped}
+
+    lines = [f"# Generated by `python -m pydantic_view compile {' '.join(modules)}`, do not edit."]
+    for view_cls, reason in skipped.items():
+        if view_cls not in generated:
+            view_decl = _view_declaration(view_cls)
+            lines.append(f"# {view_decl.__module__}.{view_decl.__qualname__} is built at runtime: {reason}.")
+    lines.append("")
+    lines += [f"import {module} as {alias}" for module, alias in sorted(renderer.modules.items())]
+    for view_cls in ordered:
+        lines += ["", "", sources[view_cls]]
+    lines.append("")
+
+    return "\n".join(lines)
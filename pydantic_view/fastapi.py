@@ -0,0 +1,102 @@
+from typing import Any, Mapping
+
+import pydantic_core
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from starlette.background import BackgroundTask
+
+from .pydantic_view import get_view
+
+
+def to_view(obj: Any, view_cls: type[BaseModel] | str) -> Any:
+    """
+    Convert root model instance or sequence of instances to the view.
+
+    View instances are returned as is, root model instances are converted the same way as by the view
+    attached to the model, e.g. `user.Out()`, and validated from attributes for views that are not attached.
+    View can be given by name.
+    """
+
+    if isinstance(view_cls, str):
+        if isinstance(obj, (list, tuple)):
+            return [to_view(x, view_cls) for x in obj]
+        if not isinstance(obj, BaseModel) or (view := get_view(type(obj), view_cls)) is None:
+            raise TypeError(f"expect model instance with {view_cls} view")
+        return to_view(obj, view)
+    if isinstance(obj, view_cls):
+        return obj
+    if isinstance(obj, view_cls.__pydantic_view_root_cls__):
+        name = view_cls.__pydantic_view_name__
+        if view_cls.__pydantic_view_params__["attach"] and get_view(type(obj), name) is view_cls:
+            return getattr(obj, name)()
+        return view_cls.model_validate(obj, from_attributes=True)
+    if isinstance(obj, (list, tuple)):
+        return [to_view(x, view_cls) for x in obj]
+    raise TypeError(f"expect {view_cls.__pydantic_view_root_cls__.__name__} or {view_cls.__name__} instance")
+
+
+class ViewResponse(JSONResponse):
+    """
+    JSON response serializing models with the view serializer.
+
+    Returned from an endpoint it bypasses FastAPI response model validation,
+    keep `response_model` in the route decorator for OpenAPI schema.
+
+    Args:
+      content: root model instance, view instance, sequence of them or any JSON serializable object.
+      view: view model class or view name to convert root model instances.
+    """
+
+    def __init__(
+        self,
+        content: Any,
+        view: type[BaseModel] | str | None = None,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        media_type: str | None = None,
+        background: BackgroundTask | None = None,
+    ):
+        self.view = view
+        super().__init__(
+            content, status_code=status_code, headers=headers, media_type=media_type, background=background
+        )
+
+    def render(self, content: Any) -> bytes:
+        if self.view is not None:
+            content = to_view(content, self.view)
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return pydantic_core.to_json(content)
+
+
+def view_response(view_cls: type[BaseModel] | str, status_code: int | None = None):
+    """
+    Dependency providing a factory of ViewResponse for the view.
+
+    Status code and headers set on the injected Response are copied to the created response.
+    Status code defaults to `status_code` argument, then to the route `status_code`.
+
+    Usage:
+      @app.get("/users/{user_id}", response_model=User.Out, response_class=ViewResponse)
+      async def get(user_id: int, respond=Depends(view_response(User.Out))):
+          return respond(db[user_id])
+    """
+
+    def dependency(request: Request, response: Response):
+        default_status_code = status_code or getattr(request.scope.get("route"), "status_code", None) or 200
+
+        def respond(content: Any, status_code: int | None = None) -> ViewResponse:
+            result = ViewResponse(
+                content,
+                view=view_cls,
+                status_code=status_code or response.status_code or default_status_code,
+            )
+            result.raw_headers.extend(
+                (k, v) for k, v in response.raw_headers if k not in {b"content-length", b"content-type"}
+            )
+            return result
+
+        return respond
+
+    return dependency
@@ -1,11 +1,50 @@
-from collections.abc import Sequence
-from copy import copy
-from types import UnionType
-from typing import Union
+import dataclasses
+import hashlib
+import re
+import threading
+import weakref
+from collections import OrderedDict, namedtuple
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from copy import copy, deepcopy
+from itertools import count, repeat
+from types import FunctionType, UnionType
+from typing import Annotated, Union
 
-from pydantic import BaseModel, create_model, field_validator, model_validator
+from pydantic import (
+    AliasChoices,
+    BaseModel,
+    TypeAdapter,
+    ValidationError,
+    create_model,
+    field_validator,
+    model_validator,
+)
+from pydantic_core import PydanticUndefined, SchemaValidator
 from pydantic._internal._decorators import Decorator
 from pydantic.errors import PydanticUndefinedAnnotation, PydanticUserError
+from pydantic.json_schema import DEFAULT_REF_TEMPLATE, GenerateJsonSchema, JsonSchemaMode, models_json_schema
+
+_json_schema_cache: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+_view_roots: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+_view_keys: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+_views_version = 0
+
+_view_memo: dict = {}
+
+_view_builds = count()
+
+_pregenerated_views: dict = {}
+
+SelectCacheInfo = namedtuple("SelectCacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+_select_cache: OrderedDict = OrderedDict()
+_select_cache_lock = threading.Lock()
+_select_cache_stats = {"hits": 0, "misses": 0, "maxsize": 256}
+
+_IMMUTABLE_DEFAULT_FACTORIES = (bool, int, float, complex, str, bytes, tuple, frozenset)
 
 
 def view(
@@ -15,6 +54,8 @@ def view(
     include: set[str] | None = None,
     exclude: set[str] | None = None,
     recursive: bool = True,
+    trusted: bool = False,
+    memoize: bool = False,
 ):
     """
     Decorator to create a Pydantic model view.
@@ -26,6 +67,9 @@ def view(
       include: set of field names to include from model.
       exclude: set of field names to exclude from model.
       recursive: ...
+      trusted: run only view validators on conversion from the model instance by default.
+      memoize: cache view instance converted from the model instance, intended for frozen models,
+        the cached instance is shared by all callers.
     """
 
     if name is not None and not isinstance(name, str):
@@ -41,6 +85,8 @@ def view(
         include=include,
         exclude=exclude,
         recursive=recursive,
+        trusted=trusted,
+        memoize=memoize,
     ):
         if hasattr(view_cls, "__pydantic_view_root_cls__"):
             root_cls = view_cls.__pydantic_view_root_cls__
@@ -56,13 +102,27 @@ def view(
         if set(view_cls.__dict__) & (exclude or set()):
             raise ValueError("view model fields conflict with exclude parameter")
 
-        view_cls.__pydantic_view_params__ = {
+        view_params = {
             "name": name,
             "attach": attach,
             "include": include,
             "exclude": exclude,
             "recursive": recursive,
+            "trusted": trusted,
+            "memoize": memoize,
         }
+        pregenerated = _pregenerated_views.get((root_cls, name))
+        if (
+            pregenerated is not None
+            and all(x in _view_keys for x in pregenerated["dependencies"])
+            and pregenerated["fingerprint"] == _view_fingerprint(root_cls, view_cls, view_params)
+        ):
+            pregenerated["view_cls"].__pydantic_view_declaration__ = view_cls
+            view_cls = pregenerated["view_cls"]
+        else:
+            pregenerated = None
+
+        view_cls.__pydantic_view_params__ = view_params
 
         def build_view(root_cls, view_cls):
             base_view_params = getattr(view_cls.__mro__[1], "__pydantic_view_params__", {})
@@ -83,31 +143,17 @@ def view(
                 exclude |= base_view_params["exclude"]
 
             def update_type(tp, view_names: Sequence[str]):
-                if getattr(tp, "__origin__", None) is not None:
-                    return tp.__class__(
-                        update_type(getattr(tp, "__origin__", tp), view_names),
-                        (
-                            tp.__metadata__
-                            if hasattr(tp, "__metadata__")
-                            else tuple(update_type(arg, view_names) for arg in tp.__args__)
-                        ),
-                    )
-                if type(tp) == UnionType:  # pylint: disable=unidiomatic-typecheck
-                    return Union[tuple(update_type(arg, view_names) for arg in tp.__args__)]  # type: ignore
-                if isinstance(tp, type) and issubclass(tp, BaseModel):
-                    for view_name in view_names:
-                        if hasattr(tp, view_name):
-                            return getattr(tp, view_name)
-                return tp
+                return _update_type(tp, lambda model: _find_view(model, view_names) or model)
 
             if recursive:
                 view_names = recursive if isinstance(recursive, (list, tuple, set)) else [name]
                 view_cls.__pydantic_view_recursive_views__ = tuple(view_names)
+                default_factories = _view_default_factories(view_cls)
                 fields = {k: copy(v) for k, v in view_cls.model_fields.items() if k in include and k not in exclude}
-                for field_info in fields.values():
+                for k, field_info in fields.items():
                     field_info.annotation = update_type(field_info.annotation, view_names)
-                    if field_info.default_factory:
-                        field_info.default_factory = update_type(field_info.default_factory, view_names)
+                    if k in default_factories:
+                        _resolve_default_factory(field_info, default_factories[k], view_names)
             else:
                 view_cls.__pydantic_view_recursive_views__ = None
                 fields = {k: v for k, v in view_cls.model_fields.items() if k in include and k not in exclude}
@@ -129,10 +175,12 @@ def view(
                     return find_fields_schema(schema["schema"])
                 return schema["ref"]
 
+            view_validators = set()
             for k, v in tuple(root_cls.__dict__.items()):
                 if (info := getattr(v, "__pydantic_view_field_validator__", None)) is not None:
                     fn = getattr(root_cls, k)
                     if info["view_names"] is None or name in info["view_names"]:
+                        view_validators.add(v.__name__)
                         view_cls.__pydantic_decorators__.field_validators[v.__name__] = Decorator(
                             cls_ref=find_ref(view_cls.__pydantic_core_schema__),
                             cls_var_name=v.__name__,
@@ -143,6 +191,7 @@ def view(
                 elif (info := getattr(v, "__pydantic_view_model_validator__", None)) is not None:
                     fn = getattr(root_cls, k)
                     if info["view_names"] is None or name in info["view_names"]:
+                        view_validators.add(v.__name__)
                         view_cls.__pydantic_decorators__.model_validators[v.__name__] = Decorator(
                             cls_ref=find_ref(view_cls.__pydantic_core_schema__),
                             cls_var_name=v.__name__,
@@ -153,6 +202,19 @@ def view(
 
             view_cls.model_rebuild(force=True)
 
+            return attach_view(root_cls, view_cls, view_validators)
+
+        def attach_view(root_cls, view_cls, view_validators):
+            view_params = view_cls.__pydantic_view_params__
+
+            name = view_params["name"]
+
+            view_cls.__pydantic_view_validators__ = frozenset(view_validators)
+            view_cls.__pydantic_view_trusted_validator__ = None
+            view_cls.__pydantic_view_columns_plan__ = None
+            view_cls.__pydantic_view_build__ = next(_view_builds)
+            _invalidate_view_caches(view_cls)
+
             class ViewRootClsDesc:
                 def __get__(self, obj, owner=None):
                     return root_cls
@@ -163,6 +225,11 @@ def view(
 
             setattr(view_cls, "__pydantic_view_name__", ViewNameClsDesc())
             setattr(view_cls, "__pydantic_view_root_cls__", ViewRootClsDesc())
+            setattr(view_cls, "diff", classmethod(_view_diff))
+            setattr(view_cls, "from_rows", classmethod(_view_from_rows))
+            setattr(view_cls, "from_columns", classmethod(_view_from_columns))
+            setattr(view_cls, "model_json_schema", classmethod(_cached_model_json_schema(view_cls)))
+            setattr(view_cls, "select", classmethod(_view_select))
 
             if attach:
 
@@ -170,14 +237,20 @@ def view(
                     def __get__(self, obj, owner=None):
                         if obj:
 
-                            def view_factory():
-                                return view_cls(
-                                    **obj.model_dump(
-                                        include=include,  # or None,
-                                        exclude=exclude,  # or None,
-                                        exclude_unset=True,
-                                    )
-                                )
+                            def view_factory(trusted: bool | None = None):
+                                memoize = trusted is None and view_cls.__pydantic_view_params__["memoize"]
+                                if memoize and (memo := _memo_get(obj, name)) is not None:
+                                    view_obj, build = memo
+                                    if build == view_cls.__pydantic_view_build__:
+                                        return view_obj
+                                data = obj.model_dump(include=_view_include(view_cls), exclude_unset=True)
+                                if view_cls.__pydantic_view_params__["trusted"] if trusted is None else trusted:
+                                    view_obj = _trusted_validator(view_cls).validate_python(data)
+                                else:
+                                    view_obj = view_cls(**data)
+                                if memoize:
+                                    _memo_set(obj, name, (view_obj, view_cls.__pydantic_view_build__))
+                                return view_obj
 
                             view_factory.__pydantic_view_name__ = name
                             view_factory.__pydantic_view_root_cls__ = root_cls
@@ -188,24 +261,22 @@ def view(
 
                 setattr(root_cls, name, ViewDesc())
 
-            if not hasattr(root_cls, "__pydantic_view_views__"):
-                setattr(root_cls, "__pydantic_view_views__", (view_cls,))
-            else:
-                setattr(
-                    root_cls,
-                    "__pydantic_view_views__",
-                    tuple(
-                        x
-                        for x in root_cls.__pydantic_view_views__
-                        if x.__pydantic_view_name__ != view_cls.__pydantic_view_name__
-                    )
-                    + (view_cls,),
-                )
+                if view_params["memoize"]:
+                    _memo_invalidate_on_setattr(root_cls)
+
+            _register_view(root_cls, name, view_cls)
 
             return view_cls
 
         try:
-            build_view(root_cls, view_cls)
+            if pregenerated is not None:
+                view_cls.__pydantic_view_recursive_views__ = view_names = pregenerated["recursive_views"]
+                if view_names is not None:
+                    for k, factory in _view_default_factories(view_cls).items():
+                        _resolve_default_factory(view_cls.model_fields[k], factory, view_names)
+                attach_view(root_cls, view_cls, pregenerated["validators"])
+            else:
+                build_view(root_cls, view_cls)
         except PydanticUserError as e:
             if "is not fully defined; you should define" not in f"{e}":
                 raise e
@@ -231,6 +302,834 @@ def view(
     return wrapper
 
 
+def _view_members(view_cls) -> list[str]:
+    """Return names of methods, validators and properties declared in the view class."""
+
+    return sorted(
+        k
+        for k, v in view_cls.__dict__.items()
+        if isinstance(v, (FunctionType, classmethod, staticmethod, property))
+        and getattr(getattr(v, "__func__", v), "__module__", None) != __name__
+    )
+
+
+def _view_declaration(view_cls):
+    """Return class declared with the view decorator, it differs from the view if pregenerated view is used."""
+
+    return view_cls.__dict__.get("__pydantic_view_declaration__", view_cls)
+
+
+def _fingerprint_value(value):
+    if isinstance(value, (set, frozenset)):
+        return sorted((_fingerprint_value(x) for x in value), key=repr)
+    if isinstance(value, (list, tuple)):
+        return [_fingerprint_value(x) for x in value]
+    if isinstance(value, dict):
+        return sorted(((k, _fingerprint_value(v)) for k, v in value.items()), key=repr)
+    return value
+
+
+def _view_fingerprint(root_cls, view_cls, view_params) -> str:
+    """Return hash of the view declaration used to check that pregenerated view is up to date."""
+
+    base_cls = view_cls.__mro__[1]
+    if base_cls is not root_cls and "__pydantic_view_params__" in base_cls.__dict__:
+        base_fingerprint = _view_fingerprint(root_cls, _view_declaration(base_cls), base_cls.__pydantic_view_params__)
+    else:
+        base_fingerprint = None
+    data = (
+        root_cls.__module__,
+        root_cls.__qualname__,
+        _fingerprint_value(view_params),
+        [(k, repr(v)) for k, v in root_cls.model_fields.items()],
+        [
+            (k, _fingerprint_value(info))
+            for k, v in root_cls.__dict__.items()
+            for info in (
+                getattr(v, "__pydantic_view_field_validator__", None),
+                getattr(v, "__pydantic_view_model_validator__", None),
+            )
+            if info is not None
+        ],
+        list(view_cls.__dict__.get("__annotations__", {}).items()),
+        sorted((k, v) for k, v in view_cls.model_config.items() if root_cls.model_config.get(k) != v),
+        _view_members(view_cls),
+        base_fingerprint,
+    )
+    return hashlib.sha1(re.sub(r" at 0x[0-9a-f]+", "", repr(data)).encode()).hexdigest()
+
+
+def register_pregenerated_view(
+    view_cls: type[BaseModel],
+    root_cls: type[BaseModel],
+    name: str,
+    fingerprint: str,
+    fields: Sequence[str],
+    recursive_views: Sequence[str] | None,
+    validators: Iterable[str],
+    dependencies: Iterable[type[BaseModel]] = (),
+):
+    """
+    Register view class generated by `python -m pydantic_view compile`.
+
+    The view decorator uses registered class instead of building the view if the view declaration
+    was not changed since generation and the generated views it depends on were used as well.
+    Schema of the class is built on first use.
+    """
+
+    view_cls.model_fields = {k: view_cls.model_fields[k] for k in fields}
+    if recursive_views is not None:
+        view_cls.__pydantic_view_default_factories__ = {
+            k: v.default_factory for k, v in view_cls.model_fields.items() if v.default_factory is not None
+        }
+    if (defer_build := root_cls.model_config.get("defer_build")) is None:
+        view_cls.model_config.pop("defer_build", None)
+    else:
+        view_cls.model_config["defer_build"] = defer_build
+
+    _pregenerated_views[(root_cls, name)] = {
+        "view_cls": view_cls,
+        "fingerprint": fingerprint,
+        "recursive_views": tuple(recursive_views) if recursive_views is not None else None,
+        "validators": frozenset(validators),
+        "dependencies": tuple(dependencies),
+    }
+
+
+def _update_type(tp, fn):
+    if getattr(tp, "__origin__", None) is not None:
+        return tp.__class__(
+            _update_type(getattr(tp, "__origin__", tp), fn),
+            (tp.__metadata__ if hasattr(tp, "__metadata__") else tuple(_update_type(arg, fn) for arg in tp.__args__)),
+        )
+    if type(tp) == UnionType:  # pylint: disable=unidiomatic-typecheck
+        return Union[tuple(_update_type(arg, fn) for arg in tp.__args__)]  # type: ignore
+    if isinstance(tp, type) and issubclass(tp, BaseModel):
+        return fn(tp)
+    return tp
+
+
+def _iter_models(tp) -> Iterator[type[BaseModel]]:
+    if getattr(tp, "__origin__", None) is not None:
+        yield from _iter_models(tp.__origin__)
+        if not hasattr(tp, "__metadata__"):
+            for arg in tp.__args__:
+                yield from _iter_models(arg)
+    elif type(tp) == UnionType:  # pylint: disable=unidiomatic-typecheck
+        for arg in tp.__args__:
+            yield from _iter_models(arg)
+    elif isinstance(tp, type) and issubclass(tp, BaseModel):
+        yield tp
+
+
+def _type_include(tp, seen):
+    """Return `model_dump` include of values of the type, None for types without models."""
+
+    if getattr(tp, "__origin__", None) is not None and hasattr(tp, "__metadata__"):
+        return _type_include(tp.__origin__, seen)
+    if isinstance(tp, type) and issubclass(tp, BaseModel):
+        if not hasattr(tp, "__pydantic_view_params__") or tp in seen:
+            return True
+        return _fields_include(tp, seen | {tp})
+    origin = getattr(tp, "__origin__", None)
+    is_union = origin is Union or type(tp) == UnionType  # pylint: disable=unidiomatic-typecheck
+    if origin is None and not is_union:
+        return None
+
+    args = getattr(tp, "__args__", ())
+    if isinstance(origin, type) and issubclass(origin, Mapping):
+        args = args[-1:]
+    elif origin is tuple and len(args) == 2 and args[1] is Ellipsis:
+        args = args[:1]
+    includes = []
+    for arg in args:
+        if (include := _type_include(arg, seen)) is not None and include not in includes:
+            includes.append(include)
+    if not includes:
+        return None
+    include = includes[0] if len(includes) == 1 else True
+    if include is True or is_union:
+        return include
+    return {"__all__": include}
+
+
+def _fields_include(model, seen) -> dict:
+    return {
+        k: True if (include := _type_include(field_info.annotation, seen)) is None else include
+        for k, field_info in model.model_fields.items()
+    }
+
+
+def _view_include(view_cls) -> dict:
+    """Return `model_dump` include of the root model instance with fields of the view and its nested views."""
+
+    if (include := view_cls.__dict__.get("__pydantic_view_include__")) is not None and include[0] == _views_version:
+        return include[1]
+    include = _fields_include(view_cls, {view_cls})
+    view_cls.__pydantic_view_include__ = (_views_version, include)
+    return include
+
+
+def _depends_on(model, view_cls) -> bool:
+    """Return True if the model is derived from the view or refers to it by fields of the model or nested models."""
+
+    seen = set()
+    stack = [model]
+    while stack:
+        if (model := stack.pop()) in seen:
+            continue
+        seen.add(model)
+        if issubclass(model, view_cls):
+            return True
+        for field_info in model.model_fields.values():
+            stack.extend(_iter_models(field_info.annotation))
+    return False
+
+
+def _invalidate_view_caches(view_cls):
+    """Drop cached JSON schemas and selected views of the view and of the models depending on it."""
+
+    for model in [x for x in list(_json_schema_cache) if _depends_on(x, view_cls)]:
+        _json_schema_cache.pop(model, None)
+    with _select_cache_lock:
+        for key in [x for x in _select_cache if _depends_on(x[0], view_cls)]:
+            del _select_cache[key]
+
+
+class _ViewsDesc:
+    def __get__(self, obj, owner=None):
+        return tuple(_views_index(owner).values())
+
+
+def _register_view(root_cls, name, view_cls):
+    global _views_version  # pylint: disable=global-statement
+
+    if "__pydantic_view_index__" not in root_cls.__dict__:
+        root_cls.__pydantic_view_index__ = {}
+        root_cls.__pydantic_view_views__ = _ViewsDesc()
+        _view_roots[root_cls] = None
+    views = root_cls.__pydantic_view_index__
+    if (old_view_cls := views.pop(name, None)) is not None:
+        _view_keys.pop(old_view_cls, None)
+    views[name] = view_cls
+    _view_keys[view_cls] = (weakref.ref(root_cls), name)
+    _views_version += 1
+
+
+def _views_index(model):
+    """Return mapping of view names to views of the model merged with views of its base models."""
+
+    if (merged := model.__dict__.get("__pydantic_view_merged_index__")) is not None and merged[0] == _views_version:
+        return merged[1]
+    views = {}
+    for cls in reversed(model.__mro__):
+        if (index := cls.__dict__.get("__pydantic_view_index__")) is not None:
+            views.update(index)
+    model.__pydantic_view_merged_index__ = (_views_version, views)
+    return views
+
+
+def _find_view(tp, view_names: Sequence[str]):
+    views = _views_index(tp)
+    for view_name in view_names:
+        if (view_cls := views.get(view_name)) is not None and view_cls.__pydantic_view_params__["attach"]:
+            return view_cls
+    return None
+
+
+def get_view(model: type[BaseModel], name: str) -> type[BaseModel] | None:
+    """
+    Return view of the model by name or None.
+
+    Views of the base models are returned for models without own views.
+    """
+
+    return _views_index(model).get(name)
+
+
+def get_view_key(view_cls: type[BaseModel]) -> tuple[type[BaseModel], str] | None:
+    """Return `(model, name)` the view is registered under or None."""
+
+    if (key := _view_keys.get(view_cls)) is None:
+        return None
+    return key[0](), key[1]
+
+
+def views_of(model: type[BaseModel]) -> dict[str, type[BaseModel]]:
+    """Return mapping of view names to views of the model."""
+
+    return dict(_views_index(model))
+
+
+def iter_views() -> Iterator[tuple[type[BaseModel], str, type[BaseModel]]]:
+    """Iterate over all registered views as `(model, name, view)` tuples."""
+
+    for root_cls in list(_view_roots):
+        for name, view_cls in tuple(root_cls.__pydantic_view_index__.items()):
+            yield root_cls, name, view_cls
+
+
+def _memo_get(obj, name):
+    if (entry := _view_memo.get(id(obj))) is not None and entry[0]() is obj:
+        return entry[1].get(name)
+    return None
+
+
+def _memo_set(obj, name, view_obj):
+    key = id(obj)
+    if (entry := _view_memo.get(key)) is None or entry[0]() is not obj:
+
+        def remove(ref, key=key):
+            if (entry := _view_memo.get(key)) is not None and entry[0] is ref:
+                del _view_memo[key]
+
+        try:
+            entry = _view_memo[key] = (weakref.ref(obj, remove), {})
+        except TypeError:
+            return
+    entry[1][name] = view_obj
+
+
+def _memo_invalidate_on_setattr(root_cls):
+    if getattr(root_cls.__dict__.get("__setattr__"), "__pydantic_view_memo__", False):
+        return
+
+    original_setattr = root_cls.__setattr__
+    original_delattr = root_cls.__delattr__
+
+    def __setattr__(self, name, value):
+        original_setattr(self, name, value)
+        _view_memo.pop(id(self), None)
+
+    def __delattr__(self, name):
+        original_delattr(self, name)
+        _view_memo.pop(id(self), None)
+
+    __setattr__.__pydantic_view_memo__ = True
+    root_cls.__setattr__ = __setattr__
+    root_cls.__delattr__ = __delattr__
+
+
+def _root_validators(view_cls) -> set:
+    """Return functions of validators the view inherits from the root model."""
+
+    def is_view_validator(name):
+        if name in view_cls.__pydantic_view_validators__:
+            return True
+        for cls in view_cls.__mro__:
+            if name in cls.__dict__:
+                return "__pydantic_view_params__" in cls.__dict__
+        return False
+
+    decorators = view_cls.__pydantic_decorators__
+    return {
+        getattr(decorator.func, "__func__", decorator.func)
+        for validators in (
+            decorators.validators,
+            decorators.field_validators,
+            decorators.root_validators,
+            decorators.model_validators,
+        )
+        for name, decorator in validators.items()
+        if not is_view_validator(name)
+    }
+
+
+def _strip_validators(schema, view_cls, functions):
+    if isinstance(schema, list):
+        return [_strip_validators(x, view_cls, functions) for x in schema]
+    if not isinstance(schema, dict):
+        return schema
+    if schema.get("type") == "model" and schema.get("cls") is not view_cls:
+        if not hasattr(schema.get("cls"), "__pydantic_view_params__"):
+            return schema
+        return _strip_validators(schema, schema["cls"], _root_validators(schema["cls"]))
+    if (
+        schema.get("type") in {"function-before", "function-after", "function-wrap", "function-plain"}
+        and isinstance(function := schema.get("function"), dict)
+        and getattr(function["function"], "__func__", function["function"]) in functions
+    ):
+        if schema["type"] == "function-plain":
+            inner = {"type": "any"}
+        else:
+            inner = _strip_validators(schema["schema"], view_cls, functions)
+        for k in ("ref", "serialization"):
+            if k in schema:
+                inner = {**inner, k: schema[k]}
+        return inner
+    return {k: v if k == "serialization" else _strip_validators(v, view_cls, functions) for k, v in schema.items()}
+
+
+def _trusted_validator(view_cls):
+    """Return validator of the view and nested views without validators inherited from the root models."""
+
+    if (validator := view_cls.__dict__.get("__pydantic_view_trusted_validator__")) is not None:
+        return validator
+
+    validator = SchemaValidator(
+        _strip_validators(view_cls.__pydantic_core_schema__, view_cls, _root_validators(view_cls))
+    )
+    view_cls.__pydantic_view_trusted_validator__ = validator
+
+    return validator
+
+
+def _view_default_factories(view_cls) -> dict:
+    """
+    Return original default factories of the view fields.
+
+    Factories are compiled on every build, originals are kept to resolve them again on views rebuild.
+    """
+
+    if (default_factories := view_cls.__dict__.get("__pydantic_view_default_factories__")) is not None:
+        return default_factories
+    inherited = getattr(view_cls, "__pydantic_view_default_factories__", {})
+    annotations = view_cls.__dict__.get("__annotations__", {})
+    default_factories = {}
+    for k, field_info in view_cls.model_fields.items():
+        if k in inherited and k not in annotations:
+            default_factories[k] = inherited[k]
+        elif field_info.default_factory is not None:
+            default_factories[k] = field_info.default_factory
+    view_cls.__pydantic_view_default_factories__ = default_factories
+    return default_factories
+
+
+def _resolve_default_factory(field_info, factory, view_names: Sequence[str]):
+    field_info.default = PydanticUndefined
+    field_info.default_factory = _update_type(factory, lambda model: _find_view(model, view_names) or model)
+    _compile_default_factory(field_info)
+
+
+def _compile_default_factory(field_info):
+    """
+    Replace default factory of the field with cheaper equivalent.
+
+    Immutable builtin factories are replaced with their result, model factories without validators
+    are replaced with `model_construct`.
+    """
+
+    factory = field_info.default_factory
+    if factory in _IMMUTABLE_DEFAULT_FACTORIES:
+        field_info.default = factory()
+        field_info.default_factory = None
+    elif isinstance(factory, type) and issubclass(factory, BaseModel):
+        decorators = factory.__pydantic_decorators__
+        if (
+            decorators.validators
+            or decorators.field_validators
+            or decorators.root_validators
+            or decorators.model_validators
+            or factory.__pydantic_root_model__
+            or factory.__init__ is not BaseModel.__init__
+            or factory.model_config.get("validate_default")
+            or any(v.is_required() or v.validate_default for v in factory.model_fields.values())
+        ):
+            return
+        field_info.default_factory = factory.model_construct
+
+
+def _diff_values(old, new, view_names):
+    if old is new:
+        return None
+    if view_names:
+        if isinstance(old, BaseModel) and isinstance(new, BaseModel):
+            view_cls = _find_view(type(old), view_names)
+            if view_cls is not None and view_cls is _find_view(type(new), view_names):
+                return _view_diff(view_cls, old, new) or None
+        elif (
+            isinstance(old, (list, tuple))
+            and isinstance(new, (list, tuple))
+            and len(old) == len(new)
+            and any(isinstance(x, BaseModel) for x in old)
+        ):
+            changes = {}
+            for i, (old_item, new_item) in enumerate(zip(old, new)):
+                if (change := _diff_values(old_item, new_item, view_names)) is not None:
+                    changes[i] = change
+            return changes or None
+        elif (
+            isinstance(old, dict)
+            and isinstance(new, dict)
+            and old.keys() == new.keys()
+            and any(isinstance(x, BaseModel) for x in old.values())
+        ):
+            changes = {}
+            for k, old_item in old.items():
+                if (change := _diff_values(old_item, new[k], view_names)) is not None:
+                    changes[k] = change
+            return changes or None
+    if old == new:
+        return None
+    if view_names:
+        return (_project_value(old, view_names), _project_value(new, view_names))
+    return (old, new)
+
+
+def _project_value(value, view_names):
+    """Return value with nested models dumped as dicts of the fields visible in their recursive views."""
+
+    if isinstance(value, BaseModel):
+        if (view_cls := _find_view(type(value), view_names)) is None:
+            return value
+        return {k: _project_value(getattr(value, k, None), view_names) for k in view_cls.model_fields}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_project_value(x, view_names) for x in value)
+    if isinstance(value, dict):
+        return {k: _project_value(v, view_names) for k, v in value.items()}
+    return value
+
+
+def _view_diff(view_cls, old, new) -> dict:
+    """
+    Compare two model instances by the fields visible in the view.
+
+    Nested models, lists and dicts of nested models are compared through their recursive views.
+
+    Args:
+      view_cls: view model class.
+      old: old model instance.
+      new: new model instance.
+
+    Returns:
+      dict of changed fields, values are `(old, new)` tuples or nested dicts of changes.
+      Nested models in `(old, new)` tuples are dumped to dicts of the fields visible in their views.
+    """
+
+    if old is new:
+        return {}
+
+    view_names = view_cls.__pydantic_view_recursive_views__
+    changes = {}
+    for k in view_cls.model_fields:
+        change = _diff_values(getattr(old, k, None), getattr(new, k, None), view_names)
+        if change is not None:
+            changes[k] = change
+    return changes
+
+
+def _columns_plan(view_cls):
+    """Return field type adapters for column-wise validation or None if the view needs row-wise validation."""
+
+    if (plan := view_cls.__dict__.get("__pydantic_view_columns_plan__")) is not None:
+        return plan or None
+
+    decorators = view_cls.__pydantic_decorators__
+    if (
+        decorators.validators
+        or decorators.field_validators
+        or decorators.root_validators
+        or decorators.model_validators
+        or decorators.field_serializers
+        or decorators.model_serializers
+        or decorators.computed_fields
+        or view_cls.__pydantic_post_init__
+        or view_cls.__private_attributes__
+        or view_cls.__init__ is not BaseModel.__init__
+        or view_cls.model_config.get("validate_default")
+        or any(
+            field_info.discriminator is not None or field_info.validate_default
+            for field_info in view_cls.model_fields.values()
+        )
+    ):
+        plan = {}
+    else:
+        config = {k: v for k, v in view_cls.model_config.items() if k not in {"title", "json_schema_extra"}}
+        plan = {}
+        for k, field_info in view_cls.model_fields.items():
+            tp = field_info.annotation
+            if field_info.metadata:
+                tp = Annotated[(tp, *field_info.metadata)]  # type: ignore
+            plan[k] = TypeAdapter(list[tp], config=config or None)  # type: ignore
+
+    view_cls.__pydantic_view_columns_plan__ = plan
+
+    return plan or None
+
+
+def _columns_aliases(view_cls) -> tuple[dict[str, str], dict[str, str]]:
+    """Return mapping of column names and aliases to field names and mapping of field names to input keys."""
+
+    fields = {}
+    keys = {}
+    for k, field_info in view_cls.model_fields.items():
+        aliases = []
+        if isinstance(field_info.validation_alias, str):
+            aliases.append(field_info.validation_alias)
+        elif isinstance(field_info.validation_alias, AliasChoices):
+            aliases += [x for x in field_info.validation_alias.choices if isinstance(x, str)]
+        elif field_info.validation_alias is None and field_info.alias is not None:
+            aliases.append(field_info.alias)
+        fields[k] = k
+        for alias in aliases:
+            fields.setdefault(alias, k)
+        keys[k] = aliases[0] if aliases and not view_cls.model_config.get("populate_by_name") else k
+    return fields, keys
+
+
+def _zip_columns(columns: Sequence[Sequence], size: int) -> Iterable[tuple]:
+    return zip(*columns) if columns else repeat((), size)
+
+
+def _view_from_columns(view_cls, columns: Mapping[str, Sequence], dump: bool = False) -> list:
+    """
+    Create view instances from column arrays.
+
+    Columns are given by field names or aliases, columns that are not fields of the view are ignored.
+
+    Args:
+      view_cls: view model class.
+      columns: mapping of field names to sequences of values of the same length.
+      dump: return dumped dicts instead of view instances.
+    """
+
+    size = len(next(iter(columns.values()))) if columns else 0
+    if any(len(v) != size for v in columns.values()):
+        raise ValueError("columns must have the same length")
+
+    fields = view_cls.model_fields
+    aliases, keys = _columns_aliases(view_cls)
+    columns = {aliases[k]: v for k, v in columns.items() if k in aliases}
+
+    plan = _columns_plan(view_cls)
+    missing = [k for k in fields if k not in columns]
+    if plan is not None and not any(fields[k].is_required() for k in missing):
+        try:
+            values = {k: plan[k].validate_python(v if isinstance(v, list) else list(v)) for k, v in columns.items()}
+        except ValidationError:
+            pass
+        else:
+            if dump:
+                for k in missing:
+                    if not fields[k].exclude:
+                        values[k] = [fields[k].get_default(call_default_factory=True) for _ in range(size)]
+                names = [k for k in fields if k in values and not fields[k].exclude]
+                dumped = [plan[k].dump_python(values[k]) for k in names]
+                return [dict(zip(names, row)) for row in _zip_columns(dumped, size)]
+
+            names = list(values)
+            fields_set = set(names)
+            extra_allowed = view_cls.model_config.get("extra") == "allow"
+            new = view_cls.__new__
+            setattr_ = object.__setattr__
+            result = []
+            for row in _zip_columns(list(values.values()), size):
+                data = dict(zip(names, row))
+                for k in missing:
+                    data[k] = fields[k].get_default(call_default_factory=True)
+                obj = new(view_cls)
+                setattr_(obj, "__dict__", data)
+                setattr_(obj, "__pydantic_fields_set__", fields_set.copy())
+                setattr_(obj, "__pydantic_extra__", {} if extra_allowed else None)
+                setattr_(obj, "__pydantic_private__", None)
+                result.append(obj)
+            return result
+
+    names = [keys[k] for k in columns]
+    result = [view_cls.model_validate(dict(zip(names, row))) for row in _zip_columns(list(columns.values()), size)]
+    if dump:
+        return [x.model_dump() for x in result]
+    return result
+
+
+def _view_from_rows(view_cls, rows: Sequence[Sequence], columns: Sequence[str], dump: bool = False) -> list:
+    """
+    Create view instances from rows of values.
+
+    Args:
+      view_cls: view model class.
+      rows: sequence of rows, each row is a sequence of values ordered as `columns`.
+      columns: field names or aliases of the row values.
+      dump: return dumped dicts instead of view instances.
+    """
+
+    rows = list(rows)
+    if any(len(row) != len(columns) for row in rows):
+        raise ValueError("rows must have the same length as columns")
+    if not rows:
+        return []
+    return _view_from_columns(view_cls, dict(zip(columns, zip(*rows))), dump=dump)
+
+
+def _cached_model_json_schema(view_cls):
+    def model_json_schema(
+        cls,
+        by_alias: bool = True,
+        ref_template: str = DEFAULT_REF_TEMPLATE,
+        schema_generator: type[GenerateJsonSchema] = GenerateJsonSchema,
+        mode: JsonSchemaMode = "validation",
+        **kwds,
+    ) -> dict:
+        key = (by_alias, ref_template, schema_generator, mode, tuple(sorted(kwds.items())))
+        schemas = _json_schema_cache.setdefault(cls, {})
+        if (schema := schemas.get(key)) is None:
+            schema = schemas[key] = super(view_cls, cls).model_json_schema(
+                by_alias=by_alias,
+                ref_template=ref_template,
+                schema_generator=schema_generator,
+                mode=mode,
+                **kwds,
+            )
+        return deepcopy(schema)
+
+    return model_json_schema
+
+
+def export_view_schemas(
+    models: Sequence[type[BaseModel]],
+    mode: JsonSchemaMode = "validation",
+    by_alias: bool = True,
+    title: str | None = None,
+    ref_template: str = DEFAULT_REF_TEMPLATE,
+    schema_generator: type[GenerateJsonSchema] = GenerateJsonSchema,
+) -> dict:
+    """
+    Generate one JSON schema document with shared `$defs` for all views of the models.
+
+    Args:
+      models: root models or views.
+      mode: JSON schema mode.
+      by_alias: use field aliases.
+      title: document title.
+      ref_template: `$ref` template.
+      schema_generator: JSON schema generator class.
+    """
+
+    views = {}
+    for model in models:
+        if hasattr(model, "__pydantic_view_params__"):
+            views[model] = None
+        for view_cls in views_of(model).values():
+            views[view_cls] = None
+
+    _, schema = models_json_schema(
+        [(view_cls, mode) for view_cls in views],
+        by_alias=by_alias,
+        title=title,
+        ref_template=ref_template,
+        schema_generator=schema_generator,
+    )
+    return schema
+
+
+def _restrict_field_decorators(cls, fields):
+    decorators = cls.__pydantic_decorators__
+    for attr in ("validators", "field_validators", "field_serializers"):
+        restricted = {}
+        for k, decorator in getattr(decorators, attr).items():
+            if "*" in decorator.info.fields:
+                restricted[k] = decorator
+            elif info_fields := tuple(x for x in decorator.info.fields if x in fields):
+                restricted[k] = dataclasses.replace(
+                    decorator, info=dataclasses.replace(decorator.info, fields=info_fields)
+                )
+        setattr(decorators, attr, restricted)
+    decorators.computed_fields = {k: v for k, v in decorators.computed_fields.items() if k in fields}
+    cls.model_computed_fields = {k: v.info for k, v in decorators.computed_fields.items()}
+
+
+def _view_select(view_cls, fields: Iterable[str]) -> type[BaseModel]:
+    """
+    Create view with subset of the view fields.
+
+    Nested fields are selected with dotted paths, e.g. `{"id", "settings.public"}`. Computed fields
+    are kept only if selected, views with model validators can't drop fields.
+    Created views are cached in LRU cache, see `select_cache_info`.
+
+    Args:
+      view_cls: view model class.
+      fields: field names or dotted paths of nested fields.
+    """
+
+    tree = {}
+    for path in fields:
+        k, _, sub_path = path.partition(".")
+        if not sub_path:
+            tree[k] = None
+        elif tree.get(k, ()) is not None:
+            tree.setdefault(k, set()).add(sub_path)
+
+    key = (view_cls, frozenset((k, frozenset(v) if v is not None else None) for k, v in tree.items()))
+    with _select_cache_lock:
+        if (selected_cls := _select_cache.get(key)) is not None:
+            _select_cache.move_to_end(key)
+            _select_cache_stats["hits"] += 1
+            return selected_cls
+        _select_cache_stats["misses"] += 1
+
+    decorators = view_cls.__pydantic_decorators__
+    if unknown := set(tree) - set(view_cls.model_fields) - set(decorators.computed_fields):
+        raise ValueError(f"unknown fields: {', '.join(sorted(unknown))}")
+    for k in tree.keys() & decorators.computed_fields.keys():
+        if tree[k] is not None:
+            raise ValueError(f"field {k} is not a model")
+    if (decorators.model_validators or decorators.root_validators) and not set(view_cls.model_fields) <= set(tree):
+        raise ValueError(f"{view_cls.__name__} has model validators, all of its fields must be selected")
+
+    model_fields = {}
+    for k, field_info in view_cls.model_fields.items():
+        if k not in tree:
+            continue
+        if (sub_fields := tree[k]) is not None:
+            models = []
+
+            def select(model, sub_fields=sub_fields, models=models):
+                models.append(model)
+                return _view_select(model, sub_fields)
+
+            field_info = copy(field_info)
+            field_info.annotation = _update_type(field_info.annotation, select)
+            if not models:
+                raise ValueError(f"field {k} is not a model")
+            factory = field_info.default_factory
+            if isinstance(factory, type) and issubclass(factory, BaseModel):
+                field_info.default_factory = select(factory)
+            elif getattr(factory, "__name__", None) == "model_construct":
+                field_info.default_factory = select(factory.__self__).model_construct
+        model_fields[k] = field_info
+
+    selected_cls = create_model(f"{view_cls.__name__}Select", __base__=view_cls, __module__=view_cls.__module__)
+    selected_cls.model_fields = model_fields
+    _restrict_field_decorators(selected_cls, tree)
+    selected_cls.model_rebuild(force=True)
+
+    with _select_cache_lock:
+        selected_cls = _select_cache.setdefault(key, selected_cls)
+        _select_cache.move_to_end(key)
+        while len(_select_cache) > _select_cache_stats["maxsize"]:
+            _select_cache.popitem(last=False)
+
+    return selected_cls
+
+
+def select_cache_info() -> SelectCacheInfo:
+    """Return hits, misses, maximum and current size of the selected views cache."""
+
+    with _select_cache_lock:
+        return SelectCacheInfo(
+            _select_cache_stats["hits"],
+            _select_cache_stats["misses"],
+            _select_cache_stats["maxsize"],
+            len(_select_cache),
+        )
+
+
+def select_cache_clear(maxsize: int | None = None):
+    """
+    Clear the selected views cache and statistics.
+
+    Args:
+      maxsize: new maximum size of the cache.
+    """
+
+    with _select_cache_lock:
+        _select_cache.clear()
+        _select_cache_stats["hits"] = 0
+        _select_cache_stats["misses"] = 0
+        if maxsize is not None:
+            _select_cache_stats["maxsize"] = maxsize
+
+
 def reapply_base_views(cls):
     for view_cls in getattr(cls, "__pydantic_view_views__", ()):
         if cls.__base__.__pydantic_generic_metadata__["args"]:
@@ -1,9 +1,35 @@
+import gc
+import threading
+import weakref
 from typing import Any, ForwardRef, List, Optional
 
 import pytest
-from pydantic import BaseModel, ValidationError, field_validator, model_validator
-
-from pydantic_view import reapply_base_views, view, view_field_validator, view_model_validator
+from pydantic import (
+    AliasChoices,
+    BaseModel,
+    ConfigDict,
+    Field,
+    ValidationError,
+    computed_field,
+    field_serializer,
+    field_validator,
+    model_validator,
+)
+
+from pydantic_view import (
+    export_view_schemas,
+    get_view,
+    get_view_key,
+    iter_views,
+    reapply_base_views,
+    select_cache_clear,
+    select_cache_info,
+    view,
+    view_field_validator,
+    view_model_validator,
+    views_of,
+)
+from pydantic_view.pydantic_view import _json_schema_cache
 
 
 def test_basic():
@@ -429,3 +455,883 @@ def test_view_validator():
     assert Model(i=1).i == 1
     assert Model(i=1).View().i == 4
     assert Model.View(i=1).i == 4
+
+
+def test_diff():
+    class SubModel(BaseModel):
+        x: int
+        y: int
+
+    @view("View", include={"x"})
+    class SubModelView(SubModel):
+        pass
+
+    class Model(BaseModel):
+        x: int
+        secret: str
+        submodel: SubModel
+        submodels: List[SubModel] = []
+        optional: Optional[SubModel] = None
+
+    @view("View", exclude={"secret"})
+    class ModelView(Model):
+        pass
+
+    old = Model(x=0, secret="a", submodel=SubModel(x=0, y=0), submodels=[SubModel(x=0, y=0)])
+
+    assert Model.View.diff(old, old) == {}
+    assert Model.View.diff(old, old.model_copy(update={"secret": "b"})) == {}
+    assert Model.View.diff(old, old.model_copy(update={"x": 1})) == {"x": (0, 1)}
+    assert Model.View.diff(old, old.model_copy(update={"submodel": SubModel(x=0, y=1)})) == {}
+    assert Model.View.diff(old, old.model_copy(update={"submodel": SubModel(x=1, y=0)})) == {"submodel": {"x": (0, 1)}}
+    assert Model.View.diff(old, old.model_copy(update={"submodels": [SubModel(x=0, y=1)]})) == {}
+    assert Model.View.diff(old, old.model_copy(update={"submodels": [SubModel(x=1, y=1)]})) == {
+        "submodels": {0: {"x": (0, 1)}}
+    }
+    assert Model.View.diff(old, old.model_copy(update={"submodels": []})) == {"submodels": ([{"x": 0}], [])}
+    assert Model.View.diff(old, old.model_copy(update={"optional": SubModel(x=1, y=1)})) == {
+        "optional": (None, {"x": 1})
+    }
+
+
+def test_from_rows_and_columns():
+    class SubModel(BaseModel):
+        x: int
+        y: int = 0
+
+    @view("View", include={"x"})
+    class SubModelView(SubModel):
+        pass
+
+    class Model(BaseModel):
+        i: int
+        s: str
+        secret: str = "secret"
+        submodel: Optional[SubModel] = None
+        items: List[int] = []
+
+        @view_field_validator(["ValidatedView"], "i")
+        @classmethod
+        def validate_i(cls, v):
+            return v * 2
+
+    @view("View", exclude={"secret"})
+    class ModelView(Model):
+        pass
+
+    @view("ValidatedView", exclude={"secret"})
+    class ModelValidatedView(Model):
+        pass
+
+    rows = [(1, "a", "b", {"x": 1}), ("2", "c", "d", None)]
+    columns = ["i", "s", "secret", "submodel"]
+
+    for view_cls in (Model.View, Model.ValidatedView):
+        expected = [view_cls(**{k: v for k, v in zip(columns, row) if k != "secret"}) for row in rows]
+
+        models = view_cls.from_rows(rows, columns=columns)
+        assert models == expected
+        assert all(type(model) == view_cls for model in models)
+        assert [model.model_fields_set for model in models] == [{"i", "s", "submodel"}] * 2
+        assert models[0].items is not models[1].items
+
+        assert view_cls.from_rows(rows, columns=columns, dump=True) == [model.model_dump() for model in expected]
+        assert view_cls.from_columns(dict(zip(columns, zip(*rows)))) == expected
+        assert view_cls.from_rows([], columns=columns) == []
+
+    assert type(Model.View.from_rows(rows, columns=columns)[0].submodel) == SubModel.View
+    assert Model.View.from_columns({"i": [1], "s": ["a"]})[0].model_fields_set == {"i", "s"}
+
+    with pytest.raises(ValidationError):
+        Model.View.from_columns({"i": ["a"], "s": ["a"]})
+    with pytest.raises(ValidationError):
+        Model.View.from_columns({"i": [1]})
+    with pytest.raises(ValueError):
+        Model.View.from_columns({"i": [1], "s": []})
+    with pytest.raises(ValueError):
+        Model.View.from_rows([(1,)], columns=["i", "s"])
+
+
+def test_from_rows_and_columns_aliases():
+    class Model(BaseModel):
+        user_id: int = Field(alias="userId")
+        name: str = Field(default="", validation_alias=AliasChoices("userName", "login"))
+
+    @view("View")
+    class ModelView(Model):
+        pass
+
+    @view("ValidatedView")
+    class ModelValidatedView(Model):
+        @field_validator("user_id")
+        @classmethod
+        def validate_user_id(cls, v):
+            return v
+
+    for view_cls in (Model.View, Model.ValidatedView):
+        assert view_cls.from_rows([(1,)], columns=["userId"]) == [view_cls(userId=1)]
+        assert view_cls.from_rows([(1, "a")], columns=["user_id", "login"]) == [view_cls(userId=1, login="a")]
+        assert view_cls.from_columns({"userId": [1, 2], "other": [0, 0]}, dump=True) == [
+            {"user_id": 1, "name": ""},
+            {"user_id": 2, "name": ""},
+        ]
+
+
+def test_from_rows_and_columns_serializers():
+    class Model(BaseModel):
+        a: int
+        b: str
+
+        @field_serializer("b")
+        def serialize_b(self, v):
+            return v.upper()
+
+        @computed_field
+        @property
+        def c(self) -> int:
+            return self.a * 10
+
+    @view("View")
+    class ModelView(Model):
+        pass
+
+    assert Model.View.from_rows([(1, "x")], columns=["a", "b"], dump=True) == [{"a": 1, "b": "X", "c": 10}]
+    assert Model.View.from_columns({"a": [1], "b": ["x"]})[0].model_dump() == {"a": 1, "b": "X", "c": 10}
+
+
+def test_from_rows_and_columns_defaults():
+    class Model(BaseModel):
+        x: int = 0
+
+    @view("View")
+    class ModelView(Model):
+        pass
+
+    @view("ValidatedView")
+    class ModelValidatedView(Model):
+        @model_validator(mode="after")
+        def validate_model(self):
+            return self
+
+    for view_cls in (Model.View, Model.ValidatedView):
+        assert view_cls.from_rows([("a",), ("b",)], columns=["other"]) == [view_cls(), view_cls()]
+        assert view_cls.from_columns({"other": [1, 2]}, dump=True) == [{"x": 0}, {"x": 0}]
+
+
+def test_from_rows_and_columns_extra_allow():
+    class Model(BaseModel):
+        model_config = ConfigDict(extra="allow")
+
+        x: int
+
+    @view("View")
+    class ModelView(Model):
+        pass
+
+    (model,) = Model.View.from_columns({"x": [1], "other": [2]})
+    assert model == Model.View(x=1)
+    assert model.model_extra == {}
+    model.y = 2
+    assert model.model_dump() == {"x": 1, "y": 2}
+
+
+def test_json_schema():
+    class SubModel(BaseModel):
+        x: int
+        y: int
+
+    @view("View", include={"x"})
+    class SubModelView(SubModel):
+        pass
+
+    class Model(BaseModel):
+        x: int
+        submodel: SubModel
+
+    @view("View")
+    class ModelView(Model):
+        pass
+
+    @view("Other", exclude={"submodel"})
+    class ModelOther(Model):
+        pass
+
+    schema = Model.View.model_json_schema()
+    assert schema["$defs"]["SubModelView"]["properties"].keys() == {"x"}
+    schema["title"] = "Changed"
+    assert Model.View.model_json_schema()["title"] == "ModelView"
+    assert Model.View.model_json_schema(mode="serialization") == Model.View.model_json_schema()
+    assert Model.View.model_json_schema(ref_template="#/components/schemas/{model}")["properties"]["submodel"] == {
+        "$ref": "#/components/schemas/SubModelView"
+    }
+
+    schema = Model.View.model_json_schema()
+    Model.views_rebuild()
+    assert Model.View.model_json_schema() == schema
+    assert Model.View.model_json_schema() is not Model.View.model_json_schema()
+
+    schema = export_view_schemas([Model, SubModel])
+    assert schema["$defs"].keys() == {"ModelView", "ModelOther", "SubModelView"}
+    assert schema["$defs"]["ModelView"]["properties"]["submodel"] == {"$ref": "#/$defs/SubModelView"}
+    assert schema["$defs"]["ModelOther"]["properties"].keys() == {"x"}
+
+
+def test_nested_exclude_extra_forbid():
+    class SubModel(BaseModel):
+        model_config = ConfigDict(extra="forbid")
+
+        public: int = 0
+        secret: int = 0
+
+    @view("Out", exclude={"secret"})
+    class SubModelOut(SubModel):
+        pass
+
+    class Model(BaseModel):
+        model_config = ConfigDict(extra="forbid")
+
+        password: str = ""
+        submodel: SubModel
+        optional: Optional[SubModel] = None
+        items: List[SubModel] = []
+        mapping: dict[str, SubModel] = {}
+
+    @view("Out", exclude={"password"})
+    class ModelOut(Model):
+        pass
+
+    submodel = SubModel(public=1, secret=2)
+    model = Model(submodel=submodel, optional=submodel, items=[submodel], mapping={"a": submodel})
+    assert model.Out().model_dump() == {
+        "submodel": {"public": 1},
+        "optional": {"public": 1},
+        "items": [{"public": 1}],
+        "mapping": {"a": {"public": 1}},
+    }
+    assert model.Out(trusted=True) == model.Out()
+
+
+def test_cache_invalidation():
+    class SubModel(BaseModel):
+        x: int = 0
+
+    @view("View")
+    class SubModelView(SubModel):
+        pass
+
+    class Model(BaseModel):
+        submodel: SubModel
+
+    @view("View")
+    class ModelView(Model):
+        pass
+
+    class Other(BaseModel):
+        y: int
+
+    @view("View")
+    class OtherView(Other):
+        pass
+
+    select_cache_clear()
+    Model.View.model_json_schema()
+    Other.View.model_json_schema()
+    model_selected = Model.View.select({"submodel.x"})
+    other_selected = Other.View.select({"y"})
+
+    @view("Out")
+    class OtherOut(Other):
+        pass
+
+    assert {Model.View, Other.View} <= set(_json_schema_cache)
+    assert Model.View.select({"submodel.x"}) is model_selected
+
+    SubModel.views_rebuild()
+
+    assert Model.View not in _json_schema_cache
+    assert Other.View in _json_schema_cache
+    assert Model.View.select({"submodel.x"}) is not model_selected
+    assert Other.View.select({"y"}) is other_selected
+
+    class Child(Other):
+        pass
+
+    @view("Child")
+    class ChildView(Child):
+        pass
+
+    @view("Late")
+    class OtherLate(Other):
+        pass
+
+    assert export_view_schemas([Child])["$defs"].keys() == {"OtherView", "OtherOut", "OtherLate", "ChildView"}
+
+
+def test_default_factory():
+    class SubModel(BaseModel):
+        x: int = 0
+        items: List[int] = []
+
+    @view("View")
+    class SubModelView(SubModel):
+        pass
+
+    class ValidatedSubModel(BaseModel):
+        x: int = 0
+
+        @model_validator(mode="after")
+        def validate_model(self):
+            self.x += 1
+            return self
+
+    class Model(BaseModel):
+        submodel: SubModel = Field(default_factory=SubModel)
+        validated: ValidatedSubModel = Field(default_factory=ValidatedSubModel)
+        t: tuple = Field(default_factory=tuple)
+        items: list = Field(default_factory=list)
+
+    @view("View")
+    class ModelView(Model):
+        pass
+
+    assert Model.View.model_fields["submodel"].default_factory == SubModel.View.model_construct
+    assert Model.View.model_fields["validated"].default_factory == ValidatedSubModel
+    assert Model.View.model_fields["t"].default_factory is None
+    assert Model.View.model_fields["t"].default == ()
+    assert Model.View.model_fields["items"].default_factory == list
+
+    model_view = Model.View()
+    assert type(model_view.submodel) == SubModel.View
+    assert model_view.submodel == SubModel.View()
+    assert model_view.submodel.model_fields_set == set()
+    assert model_view.submodel.items is not Model.View().submodel.items
+    assert model_view.validated.x == 1
+    assert model_view.t == ()
+    assert model_view.items is not Model.View().items
+    assert model_view.model_dump() == {"submodel": {"x": 0, "items": []}, "validated": {"x": 1}, "t": (), "items": []}
+
+
+def test_default_factory_views_rebuild():
+    class SubModel(BaseModel):
+        public: int = 0
+        secret: int = 0
+
+    class Model(BaseModel):
+        submodel: SubModel = Field(default_factory=SubModel)
+        t: tuple = Field(default_factory=tuple)
+
+    @view("View")
+    class ModelView(Model):
+        pass
+
+    @view("View", exclude={"secret"})
+    class SubModelView(SubModel):
+        pass
+
+    assert type(Model.View().submodel) == SubModel
+
+    Model.views_rebuild()
+    assert Model.View.model_fields["submodel"].annotation == SubModel.View
+    assert Model.View.model_fields["submodel"].default_factory == SubModel.View.model_construct
+    assert type(Model.View().submodel) == SubModel.View
+    assert Model.View().model_dump() == {"submodel": {"public": 0}, "t": ()}
+
+    @view("ViewChild")
+    class ModelViewChild(ModelView):
+        pass
+
+    assert Model.ViewChild.model_fields["submodel"].default_factory == SubModel.model_construct
+    assert type(Model.ViewChild().submodel) == SubModel
+
+
+def test_default_factory_forward_refs():
+    class SubModel(BaseModel):
+        public: int = 0
+        secret: int = 0
+
+    class Model(BaseModel):
+        submodel: SubModel = Field(default_factory=SubModel)
+        f: "F"
+
+    @view("View")
+    class ModelView(Model):
+        pass
+
+    @view("View", exclude={"secret"})
+    class SubModelView(SubModel):
+        pass
+
+    class F(BaseModel):
+        x: int = 0
+
+    Model.model_rebuild()
+    ModelView.model_rebuild()
+    Model.views_rebuild()
+    assert type(Model.View(f={}).submodel) == SubModel.View
+    assert Model.View(f={}).model_dump() == {"submodel": {"public": 0}, "f": {"x": 0}}
+
+
+def test_trusted():
+    calls = []
+
+    class Model(BaseModel):
+        i: int
+        s: str
+
+        @field_validator("s")
+        @classmethod
+        def validate_s(cls, v):
+            calls.append("validate_s")
+            return v
+
+        @model_validator(mode="after")
+        def validate_model(self):
+            calls.append("validate_model")
+            return self
+
+        @view_field_validator(["View", "TrustedView"], "i")
+        @classmethod
+        def validate_i(cls, v):
+            calls.append("validate_i")
+            return v * 2
+
+    @view("View")
+    class ModelView(Model):
+        @model_validator(mode="after")
+        def validate_view(self):
+            calls.append("validate_view")
+            return self
+
+    @view("TrustedView", trusted=True)
+    class ModelTrustedView(Model):
+        pass
+
+    model = Model(i=1, s="a")
+    assert calls == ["validate_s", "validate_model"]
+
+    calls.clear()
+    model_view = model.View()
+    assert type(model_view) == Model.View
+    assert model_view.i == 2
+    assert calls == ["validate_i", "validate_s", "validate_model", "validate_view"]
+
+    calls.clear()
+    model_view = model.View(trusted=True)
+    assert type(model_view) == Model.View
+    assert model_view.i == 2
+    assert model_view.model_fields_set == {"i", "s"}
+    assert calls == ["validate_i", "validate_view"]
+
+    calls.clear()
+    assert model.TrustedView().i == 2
+    assert calls == ["validate_i"]
+
+    calls.clear()
+    assert model.TrustedView(trusted=False).i == 2
+    assert calls == ["validate_i", "validate_s", "validate_model"]
+
+    calls.clear()
+    assert Model.TrustedView(i=1, s="a").i == 2
+    assert calls == ["validate_i", "validate_s", "validate_model"]
+
+
+def test_trusted_validator_modes():
+    calls = []
+
+    class Model(BaseModel):
+        a: int
+        b: int
+        c: int
+        d: str
+
+        @field_validator("a", mode="plain")
+        @classmethod
+        def validate_a(cls, v):
+            calls.append("validate_a")
+            return int(v)
+
+        @field_validator("b", mode="wrap")
+        @classmethod
+        def validate_b(cls, v, handler):
+            calls.append("validate_b")
+            return handler(v)
+
+        @field_validator("c", mode="before")
+        @classmethod
+        def validate_c(cls, v):
+            calls.append("validate_c")
+            return v
+
+        @field_serializer("d", mode="wrap")
+        def serialize_d(self, v, handler):
+            return handler(v).upper()
+
+    @view("View")
+    class ModelView(Model):
+        pass
+
+    @view("TrustedView", trusted=True)
+    class ModelTrustedView(Model):
+        pass
+
+    model = Model(a=1, b=2, c=3, d="d")
+
+    calls.clear()
+    model_view = model.View(trusted=True)
+    assert model_view.model_dump() == {"a": 1, "b": 2, "c": 3, "d": "D"}
+    assert calls == []
+
+    model_view = model.TrustedView()
+    assert type(model_view) == Model.TrustedView
+    assert model_view.model_dump() == {"a": 1, "b": 2, "c": 3, "d": "D"}
+    assert calls == []
+
+    assert model.TrustedView(trusted=False).model_dump() == {"a": 1, "b": 2, "c": 3, "d": "D"}
+    assert calls == ["validate_a", "validate_b", "validate_c"]
+
+
+def test_trusted_nested():
+    calls = []
+
+    class SubModel(BaseModel):
+        x: int
+
+        @field_validator("x")
+        @classmethod
+        def validate_x(cls, v):
+            calls.append("validate_x")
+            return v
+
+        @view_field_validator({"TrustedView"}, "x")
+        @classmethod
+        def validate_view_x(cls, v):
+            calls.append("validate_view_x")
+            return v
+
+    @view("TrustedView")
+    class SubModelTrustedView(SubModel):
+        pass
+
+    class Other(BaseModel):
+        y: int
+
+        @field_validator("y")
+        @classmethod
+        def validate_y(cls, v):
+            calls.append("validate_y")
+            return v
+
+    class Model(BaseModel):
+        submodel: SubModel
+        submodels: List[SubModel] = []
+        other: Other
+
+        @model_validator(mode="after")
+        def validate_model(self):
+            calls.append("validate_model")
+            return self
+
+    @view("TrustedView", trusted=True)
+    class ModelTrustedView(Model):
+        pass
+
+    model = Model(submodel=SubModel(x=1), submodels=[SubModel(x=2)], other=Other(y=3))
+
+    calls.clear()
+    model_view = model.TrustedView()
+    assert type(model_view.submodel) == SubModel.TrustedView
+    assert model_view.model_dump() == {"submodel": {"x": 1}, "submodels": [{"x": 2}], "other": {"y": 3}}
+    assert calls == ["validate_view_x", "validate_view_x", "validate_y"]
+
+    calls.clear()
+    model.TrustedView(trusted=False)
+    assert sorted(calls) == [
+        "validate_model",
+        "validate_view_x",
+        "validate_view_x",
+        "validate_x",
+        "validate_x",
+        "validate_y",
+    ]
+
+
+def test_views_index():
+    class Model(BaseModel):
+        x: int
+
+    @view("View")
+    class ModelView(Model):
+        pass
+
+    @view("Hidden", attach=False)
+    class ModelHidden(Model):
+        pass
+
+    class Child(Model):
+        pass
+
+    @view("Other")
+    class ChildOther(Child):
+        pass
+
+    assert get_view(Model, "View") is ModelView
+    assert get_view(Model, "Hidden") is ModelHidden
+    assert get_view(Model, "Other") is None
+    assert get_view(Model.View, "View") is ModelView
+    assert get_view(Child, "View") is ModelView
+    assert get_view(Child, "Other") is ChildOther
+    assert views_of(Model) == {"View": ModelView, "Hidden": ModelHidden}
+    assert views_of(Child) == {"View": ModelView, "Hidden": ModelHidden, "Other": ChildOther}
+    assert Model.__pydantic_view_views__ == (ModelView, ModelHidden)
+    assert Child.__pydantic_view_views__ == (ModelView, ModelHidden, ChildOther)
+    assert get_view_key(ModelView) == (Model, "View")
+    assert get_view_key(ChildOther) == (Child, "Other")
+    assert get_view_key(Model) is None
+
+    @view("View", force=True)
+    class ModelViewNew(Model):
+        pass
+
+    assert get_view(Model, "View") is ModelViewNew
+    assert Model.__pydantic_view_views__ == (ModelHidden, ModelViewNew)
+    assert get_view_key(ModelViewNew) == (Model, "View")
+    assert get_view_key(ModelView) is None
+
+    views = list(iter_views())
+    assert (Model, "View", ModelViewNew) in views
+    assert (Model, "Hidden", ModelHidden) in views
+    assert (Child, "Other", ChildOther) in views
+    assert (Model, "View", ModelView) not in views
+    assert (Child, "View", ModelViewNew) not in views
+    assert get_view(Child, "View") is ModelViewNew
+
+
+def test_views_index_collected():
+    def declare():
+        class Model(BaseModel):
+            x: int
+
+        @view("View")
+        class ModelView(Model):
+            pass
+
+        return weakref.ref(ModelView)
+
+    view_ref = declare()
+    gc.collect()
+    assert view_ref() is None
+
+
+def test_views_index_late_base_view():
+    class Base(BaseModel):
+        x: int
+        y: int = 0
+
+    class Child(Base):
+        pass
+
+    @view("A")
+    class ChildA(Child):
+        pass
+
+    @view("Out", exclude={"y"})
+    class BaseOut(Base):
+        pass
+
+    class Model(BaseModel):
+        child: Child
+
+    @view("Out")
+    class ModelOut(Model):
+        pass
+
+    assert Child.Out is BaseOut
+    assert get_view(Child, "Out") is BaseOut
+    assert views_of(Child) == {"Out": BaseOut, "A": ChildA}
+    assert Child.__pydantic_view_views__ == (BaseOut, ChildA)
+    assert Model.Out.model_fields["child"].annotation is BaseOut
+    assert Model(child=Child(x=1, y=2)).Out().model_dump() == {"child": {"x": 1}}
+
+
+def test_select():
+    class SubModel(BaseModel):
+        public: Optional[str] = None
+        secret: Optional[str] = None
+        other: int = 0
+
+    @view("View", exclude={"secret"})
+    class SubModelView(SubModel):
+        pass
+
+    class Model(BaseModel):
+        id: int
+        name: str
+        submodel: SubModel = Field(default_factory=SubModel)
+        submodels: List[SubModel] = []
+
+        @field_validator("id", "name")
+        @classmethod
+        def validate_name(cls, v):
+            return v
+
+    @view("View")
+    class ModelView(Model):
+        pass
+
+    select_cache_clear()
+
+    selected_cls = Model.View.select({"id", "submodel.public", "submodels.other"})
+    assert issubclass(selected_cls, Model.View)
+    assert set(selected_cls.model_fields) == {"id", "submodel", "submodels"}
+    submodel_cls = selected_cls.model_fields["submodel"].annotation
+    assert issubclass(submodel_cls, SubModel.View)
+    assert set(submodel_cls.model_fields) == {"public"}
+    assert set(selected_cls.model_fields["submodels"].annotation.__args__[0].model_fields) == {"other"}
+
+    model = Model(id=0, name="name", submodel=SubModel(public="a", secret="b"), submodels=[SubModel(other=1)])
+    assert selected_cls.model_validate(model, from_attributes=True).model_dump() == {
+        "id": 0,
+        "submodel": {"public": "a"},
+        "submodels": [{"other": 1}],
+    }
+    assert type(selected_cls(id=0).submodel) == submodel_cls
+
+    assert select_cache_info() == (1, 3, 256, 3)
+    assert Model.View.select(["submodels.other", "submodel.public", "id"]) is selected_cls
+    assert select_cache_info() == (2, 3, 256, 3)
+
+    assert set(Model.View.select({"submodel", "submodel.public"}).model_fields["submodel"].annotation.model_fields) == {
+        "public",
+        "other",
+    }
+
+    with pytest.raises(ValueError):
+        Model.View.select({"unknown"})
+    with pytest.raises(ValueError):
+        Model.View.select({"id.x"})
+
+    select_cache_clear(maxsize=1)
+    Model.View.select({"id"})
+    Model.View.select({"name"})
+    assert select_cache_info() == (0, 2, 1, 1)
+
+    selected_ref = weakref.ref(Model.View.select({"id"}))
+    assert selected_ref().model_json_schema()["properties"] == {"id": {"title": "Id", "type": "integer"}}
+    Model.View.select({"name"})
+    gc.collect()
+    assert selected_ref() is None
+
+    errors = []
+
+    def select():
+        try:
+            for i in range(50):
+                Model.View.select([("id", "name", "submodel.public")[i % 3]])
+                if i % 10 == 0:
+                    select_cache_clear(maxsize=1)
+        except Exception as e:  # pylint: disable=broad-except
+            errors.append(e)
+
+    threads = [threading.Thread(target=select) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+    select_cache_clear(maxsize=256)
+
+
+def test_select_computed_fields_and_model_validators():
+    class SubModel(BaseModel):
+        a: int = 0
+        b: int = 0
+
+        @model_validator(mode="after")
+        def validate_model(self):
+            assert self.a <= self.b
+            return self
+
+    @view("View")
+    class SubModelView(SubModel):
+        pass
+
+    class Model(BaseModel):
+        x: int
+        y: int = 0
+        submodel: SubModel = Field(default_factory=SubModel)
+
+        @computed_field
+        @property
+        def total(self) -> int:
+            return self.x + self.y
+
+    @view("View")
+    class ModelView(Model):
+        pass
+
+    model = Model(x=1, y=2)
+    assert Model.View.select({"x"}).model_validate(model, from_attributes=True).model_dump() == {"x": 1}
+    assert Model.View.select({"x", "y", "total"}).model_validate(model, from_attributes=True).model_dump() == {
+        "x": 1,
+        "y": 2,
+        "total": 3,
+    }
+    assert Model.View.select({"x"}).model_json_schema(mode="serialization")["properties"].keys() == {"x"}
+    assert Model.View.select({"submodel"}).model_validate(model, from_attributes=True).model_dump() == {
+        "submodel": {"a": 0, "b": 0}
+    }
+    assert set(Model.View.select({"submodel.a", "submodel.b"}).model_fields) == {"submodel"}
+
+    with pytest.raises(ValueError, match="SubModelView has model validators"):
+        Model.View.select({"submodel.a"})
+    with pytest.raises(ValueError, match="total is not a model"):
+        Model.View.select({"total.x"})
+
+
+def test_memoize():
+    class FrozenModel(BaseModel):
+        model_config = ConfigDict(frozen=True)
+
+        x: int
+
+    @view("View", memoize=True)
+    class FrozenModelView(FrozenModel):
+        pass
+
+    @view("Other")
+    class FrozenModelOther(FrozenModel):
+        pass
+
+    model = FrozenModel(x=1)
+    assert model.View() is model.View()
+    assert model.View() is not model.View(trusted=False)
+    assert model.Other() is not model.Other()
+    assert FrozenModel(x=1).View() is not model.View()
+
+    class Model(BaseModel):
+        x: int
+        y: int = 0
+
+    @view("View", memoize=True)
+    class ModelView(Model):
+        pass
+
+    model = Model(x=1)
+    model_view = model.View()
+    assert model.View() is model_view
+    model.x = 2
+    assert model.View() is not model_view
+    assert model.View().x == 2
+    assert model.View() is model.View()
+
+    model_view = model.View()
+    Model.views_rebuild()
+    assert type(model.View()) == Model.View
+    assert model.View() is not model_view
+    assert model.View() is model.View()
+
+    model_view_ref = weakref.ref(model.View())
+    del model, model_view
+    gc.collect()
+    assert model_view_ref() is None
@@ -1,10 +1,11 @@
 from typing import Optional
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Response
 from fastapi.testclient import TestClient
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from pydantic_view import view, view_field_validator
+from pydantic_view.fastapi import ViewResponse, to_view, view_response
 
 
 class UserSettings(BaseModel):
@@ -102,6 +103,27 @@ async def patch(user_id: int, user: User.Patch) -> User.Out:
     return db[user_id]
 
 
+@app.get("/view/users/{user_id}", response_model=User.Out, response_class=ViewResponse)
+async def view_get(user_id: int, response: Response, respond=Depends(view_response(User.Out))):
+    response.headers["x-user-id"] = f"{user_id}"
+    return respond(db[user_id])
+
+
+@app.get("/view/users", response_model=list[User.Out], response_class=ViewResponse)
+async def view_list():
+    return ViewResponse([db[0], to_view(db[0], User.Out)], view="Out", status_code=201)
+
+
+@app.post("/view/users", response_model=User.Out, response_class=ViewResponse, status_code=201)
+async def view_post(user: User.Create, respond=Depends(view_response(User.Out))):
+    return respond(User(id=1, **user.model_dump()))
+
+
+@app.put("/view/users/{user_id}", response_model=User.Out, response_class=ViewResponse)
+async def view_put(user_id: int, user: User.Update, respond=Depends(view_response(User.Out, status_code=202))):
+    return respond(User(id=user_id, **user.model_dump()))
+
+
 def test_fastapi():
     client = TestClient(app)
 
@@ -159,3 +181,66 @@ def test_fastapi():
         "username": "guest",
         "settings": {"public": "bar"},
     }
+
+
+def test_fastapi_view_response():
+    client = TestClient(app)
+
+    db[0] = User(id=0, username="admin", password="admin", settings=UserSettings(public="foo", secret="secret"))
+
+    response = client.get("/view/users/0")
+    assert response.status_code == 200, response.text
+    assert response.headers["x-user-id"] == "0"
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {
+        "id": 0,
+        "username": "admin",
+        "settings": {"public": "foo"},
+    }
+
+    response = client.get("/view/users")
+    assert response.status_code == 201, response.text
+    assert response.json() == [{"id": 0, "username": "admin", "settings": {"public": "foo"}}] * 2
+
+    response = client.post("/view/users", json={"username": "user", "password": "user"})
+    assert response.status_code == 201, response.text
+    assert response.json() == {"id": 1, "username": "user", "settings": {"public": None}}
+
+    response = client.put("/view/users/1", json={"username": "user", "password": "user", "settings": {}})
+    assert response.status_code == 202, response.text
+
+    openapi = client.get("/openapi.json").json()
+    assert (
+        openapi["paths"]["/view/users/{user_id}"]["get"]["responses"]["200"]
+        == openapi["paths"]["/users/{user_id}"]["get"]["responses"]["200"]
+    )
+
+
+def test_to_view():
+    calls = []
+
+    class Model(BaseModel):
+        model_config = ConfigDict(frozen=True)
+
+        x: int
+
+        @field_validator("x")
+        @classmethod
+        def validate_x(cls, v):
+            calls.append("validate_x")
+            return v
+
+    @view("Out", trusted=True, memoize=True)
+    class ModelOut(Model):
+        pass
+
+    @view("Hidden", attach=False)
+    class ModelHidden(Model):
+        pass
+
+    model = Model(x=1)
+    calls.clear()
+    assert to_view(model, Model.Out) is model.Out()
+    assert to_view([model], "Out")[0] is model.Out()
+    assert calls == []
+    assert to_view(model, ModelHidden) == ModelHidden(x=1)
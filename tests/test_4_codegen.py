@@ -0,0 +1,275 @@
+import importlib
+import subprocess
+import sys
+import textwrap
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+import pydantic_view.pydantic_view
+from pydantic_view import view
+from pydantic_view.codegen import generate_views_module
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    (tmp_path / "codegen_pkg").mkdir()
+    (tmp_path / "codegen_pkg" / "__init__.py").write_text("")
+    (tmp_path / "codegen_pkg" / "models.py").write_text(textwrap.dedent("""
+            from typing import List, Optional
+
+            from pydantic import BaseModel, ConfigDict, Field
+
+            from pydantic_view import view_field_validator
+
+
+            class UserSettings(BaseModel):
+                model_config = ConfigDict(extra="forbid")
+
+                public: Optional[str] = None
+                secret: Optional[str] = None
+
+
+            class User(BaseModel):
+                model_config = ConfigDict(extra="forbid")
+
+                id: int
+                username: str = Field(min_length=1, description="name")
+                password: str = Field(default_factory=lambda: "password")
+                settings: UserSettings
+                tags: List[str] = []
+
+                @view_field_validator({"Create"}, "username")
+                @classmethod
+                def validate_username(cls, v):
+                    if len(v) < 3:
+                        raise ValueError
+                    return v
+            """))
+    (tmp_path / "codegen_pkg" / "views.py").write_text(textwrap.dedent("""
+            from pydantic import Field
+
+            from pydantic_view import view
+
+            from .models import User, UserSettings
+
+
+            @view("Out", exclude={"secret"})
+            class UserSettingsOut(UserSettings):
+                pass
+
+
+            @view("Create")
+            class UserSettingsCreate(UserSettings):
+                pass
+
+
+            @view("Out", exclude={"password"})
+            class UserOut(User):
+                pass
+
+
+            @view("Create", exclude={"id"})
+            class UserCreate(User):
+                settings: UserSettings = Field(default_factory=UserSettings)
+
+
+            @view("Method")
+            class UserMethod(User):
+                def hello(self):
+                    return "hello"
+            """))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield tmp_path / "codegen_pkg"
+    for k in list(sys.modules):
+        if k.startswith("codegen_pkg"):
+            del sys.modules[k]
+
+
+def test_codegen(package):
+    source = generate_views_module(["codegen_pkg.views"])
+
+    assert "# codegen_pkg.views.UserMethod is built at runtime: declares hello." in source
+    assert "class UserMethod" not in source
+    compile(source, "_views.py", "exec")
+
+    for k in list(sys.modules):
+        if k.startswith("codegen_pkg"):
+            del sys.modules[k]
+
+    (package / "_views.py").write_text(source)
+    importlib.invalidate_caches()
+    generated = importlib.import_module("codegen_pkg._views")
+    importlib.import_module("codegen_pkg.views")
+    models = importlib.import_module("codegen_pkg.models")
+    User, UserSettings = models.User, models.UserSettings
+
+    assert User.Out is generated.UserOut
+    assert User.Create is generated.UserCreate
+    assert UserSettings.Out is generated.UserSettingsOut
+    assert User.Method is not generated.__dict__.get("UserMethod")
+
+    assert set(User.Out.model_fields) == {"id", "username", "settings", "tags"}
+    assert set(User.Create.model_fields) == {"username", "password", "settings", "tags"}
+    assert User.Out.model_fields["settings"].annotation is UserSettings.Out
+
+    user = User(id=0, username="user", settings={"public": "a"})
+    assert user.Out().model_dump() == {"id": 0, "username": "user", "settings": {"public": "a"}, "tags": []}
+    assert isinstance(user.Out().settings, UserSettings.Out)
+    assert User.Method(**user.model_dump()).hello() == "hello"
+
+    assert type(User.Create(username="admin").settings) == UserSettings.Create
+    assert User.Create(username="admin").model_dump() == {
+        "username": "admin",
+        "password": "password",
+        "settings": {"public": None, "secret": None},
+        "tags": [],
+    }
+    with pytest.raises(ValidationError):
+        User.Create(username="a")
+    with pytest.raises(ValidationError):
+        User.Create(username="")
+    with pytest.raises(ValidationError):
+        User.Out(id=0, username="user", settings={}, password="password")
+
+    schema = User.Out.model_json_schema()
+    assert schema["properties"]["username"] == {
+        "description": "name",
+        "minLength": 1,
+        "title": "Username",
+        "type": "string",
+    }
+    assert "secret" not in schema["$defs"]["UserSettingsOut"]["properties"]
+
+
+def test_codegen_changed_view(package):
+    source = generate_views_module(["codegen_pkg.views"])
+
+    for k in list(sys.modules):
+        if k.startswith("codegen_pkg"):
+            del sys.modules[k]
+
+    (package / "_views.py").write_text(source)
+    importlib.invalidate_caches()
+    (package / "views.py").write_text(
+        (package / "views.py").read_text().replace('exclude={"password"}', 'exclude={"password", "tags"}')
+    )
+    generated = importlib.import_module("codegen_pkg._views")
+    importlib.import_module("codegen_pkg.views")
+    User = importlib.import_module("codegen_pkg.models").User
+
+    assert User.Out is not generated.UserOut
+    assert set(User.Out.model_fields) == {"id", "username", "settings"}
+    assert User.Create is generated.UserCreate
+
+
+def import_generated(package, source, replace: dict[str, dict[str, str]]):
+    for k in list(sys.modules):
+        if k.startswith("codegen_pkg"):
+            del sys.modules[k]
+
+    (package / "_views.py").write_text(source)
+    for filename, replacements in replace.items():
+        text = (package / filename).read_text()
+        for old, new in replacements.items():
+            assert old in text
+            text = text.replace(old, new)
+        (package / filename).write_text(text)
+    importlib.invalidate_caches()
+
+    generated = importlib.import_module("codegen_pkg._views")
+    importlib.import_module("codegen_pkg.views")
+    return generated, importlib.import_module("codegen_pkg.models")
+
+
+def test_codegen_changed_root_field(package):
+    source = generate_views_module(["codegen_pkg.views"])
+    generated, models = import_generated(
+        package,
+        source,
+        {"models.py": {'Field(min_length=1, description="name")': 'Field(alias="userName", max_length=3)'}},
+    )
+
+    assert models.User.Out is not generated.UserOut
+    assert models.User.Out.model_fields["username"].alias == "userName"
+    assert models.UserSettings.Out is generated.UserSettingsOut
+
+
+def test_codegen_changed_root_validators(package):
+    source = generate_views_module(["codegen_pkg.views"])
+    generated, models = import_generated(
+        package,
+        source,
+        {
+            "models.py": {
+                '@view_field_validator({"Create"}, "username")': '@view_field_validator({"Create", "Out"}, "username")'
+            }
+        },
+    )
+
+    assert models.User.Out is not generated.UserOut
+    assert models.User.Create is not generated.UserCreate
+    with pytest.raises(ValidationError):
+        models.User.Out(id=0, username="a", settings={})
+
+
+def test_codegen_changed_nested_view(package):
+    source = generate_views_module(["codegen_pkg.views"])
+    assert "dependencies=[UserSettingsOut]," in source
+    generated, models = import_generated(
+        package, source, {"views.py": {'exclude={"secret"}': 'exclude={"secret", "public"}'}}
+    )
+
+    assert models.UserSettings.Out is not generated.UserSettingsOut
+    assert models.User.Out is not generated.UserOut
+    assert models.User.Out.model_fields["settings"].annotation is models.UserSettings.Out
+    assert models.User.Create is generated.UserCreate
+    user = models.User(id=0, username="user", settings={"public": "a", "secret": "b"})
+    assert user.Out().model_dump() == {"id": 0, "username": "user", "settings": {}, "tags": []}
+
+
+def test_codegen_regenerate(package):
+    source = generate_views_module(["codegen_pkg.views"])
+    generated, models = import_generated(package, source, {})
+
+    assert models.User.Out is generated.UserOut
+    assert generate_views_module(["codegen_pkg.views"]) == source
+
+
+def test_codegen_views_in_models_module(package):
+    (package / "models.py").write_text(
+        (package / "models.py").read_text() + (package / "views.py").read_text().replace("from .models import", "#")
+    )
+    source = generate_views_module(["codegen_pkg.models"])
+
+    assert "class UserOut" not in source
+    assert "register_pregenerated_view" not in source
+    assert (
+        "# codegen_pkg.models.UserOut is built at runtime: "
+        "declared in codegen_pkg.models imported by the generated module."
+    ) in source
+
+
+def test_fingerprint_is_lazy(monkeypatch):
+    def fingerprint(*args):
+        raise AssertionError
+
+    monkeypatch.setattr(pydantic_view.pydantic_view, "_view_fingerprint", fingerprint)
+
+    class Model(BaseModel):
+        x: int
+
+    @view("View")
+    class ModelView(Model):
+        pass
+
+    assert Model.View is ModelView
+
+
+def test_codegen_cli(package, tmp_path):
+    subprocess.run(
+        [sys.executable, "-m", "pydantic_view", "compile", "codegen_pkg.views", "-o", str(package / "_views.py")],
+        check=True,
+        cwd=tmp_path,
+    )
+    assert "_pydantic_view.register_pregenerated_view(" in (package / "_views.py").read_text()
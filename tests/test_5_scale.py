@@ -0,0 +1,238 @@
+import gc
+import math
+import os
+import random
+import sys
+import tracemalloc
+import types
+import warnings
+from itertools import count
+from time import perf_counter
+from typing import Optional, Union
+
+import pytest
+
+from pydantic_view import reapply_base_views, view
+from pydantic_view.pydantic_view import _update_type, _view_roots
+
+# PYDANTIC_VIEW_SCALE=1 python -m pytest -s tests/test_5_scale.py
+SCALE = int(os.environ.get("PYDANTIC_VIEW_SCALE") or 0)
+
+pytestmark = pytest.mark.skipif(not SCALE, reason="set PYDANTIC_VIEW_SCALE to run scaling harness")
+
+_modules = count()
+
+_graphs = []
+
+
+def make_graph(models: int, fields: int, nested: bool = False, refs: int = 0, forward_refs: bool = False, seed=0):
+    """
+    Create module with synthetic models M0..M{models - 1}.
+
+    Every model has int fields f0..f{fields - 1}, with `nested` model Mi refers to M{i + 1} with field `r`,
+    with `refs` model refers to randomly chosen models with fields x0..x{refs - 1}. Models are declared
+    in order with string annotations if `forward_refs` and in reverse order otherwise.
+    """
+
+    rnd = random.Random(seed)
+    lines = ["from typing import Optional", "", "from pydantic import BaseModel", ""]
+    for i in range(models) if forward_refs else reversed(range(models)):
+        lines += ["", f"class M{i}(BaseModel):"]
+        lines += [f"    f{k}: int = {k}" for k in range(fields)]
+        targets = [i + 1] if nested and i + 1 < models else []
+        targets += [rnd.randrange(i + 1, models) for _ in range(refs) if i + 1 < models]
+        for k, j in enumerate(targets):
+            tp = f'"M{j}"' if forward_refs else f"M{j}"
+            lines.append(f"    {'r' if nested and k == 0 else f'x{k}'}: Optional[{tp}] = None")
+        lines.append("")
+
+    module = types.ModuleType(f"_pydantic_view_scale_{next(_modules)}")
+    sys.modules[module.__name__] = module
+    _graphs.append(module)
+    exec("\n".join(lines), module.__dict__)  # pylint: disable=exec-used
+    module.models = [getattr(module, f"M{i}") for i in range(models)]
+    module.forward_refs = forward_refs
+    return module
+
+
+def drop_graphs():
+    """Remove created modules and their models from the views registry."""
+
+    names = set()
+    while _graphs:
+        module = _graphs.pop()
+        names.add(module.__name__)
+        sys.modules.pop(module.__name__, None)
+        module.__dict__.clear()
+    for root_cls in list(_view_roots):
+        if root_cls.__module__ in names:
+            del _view_roots[root_cls]
+    gc.collect()
+
+
+def add_views(module, views: int, recursive: bool = True):
+    """
+    Declare views V0..V{views - 1} of every model, V{k} excludes field f{k}. Views are declared in
+    models declaration order, so with forward refs nested views are found only by `views_rebuild`.
+    """
+
+    for root_cls in module.models if module.forward_refs else reversed(module.models):
+        fields = [k for k in root_cls.model_fields if k.startswith("f")]
+        for k in range(views):
+            view_cls = type(f"{root_cls.__name__}V{k}", (root_cls,), {"__module__": module.__name__})
+            view(f"V{k}", exclude={fields[k % len(fields)]}, recursive=recursive)(view_cls)
+
+
+def make_instance(module):
+    data = None
+    for root_cls in reversed(module.models):
+        data = {"r": data} if data is not None and "r" in root_cls.model_fields else {}
+    return module.models[0].model_validate(data)
+
+
+def measure(fn, setup=lambda: None, repeat=3, memory=False):
+    """Return best time of `repeat` runs of `fn(setup())` and peak traced memory of the last run."""
+
+    seconds = math.inf
+    for _ in range(repeat):
+        arg = setup()
+        t0 = perf_counter()
+        fn(arg)
+        seconds = min(seconds, perf_counter() - t0)
+    peak = 0
+    if memory:
+        arg = setup()
+        tracemalloc.start()
+        try:
+            fn(arg)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return seconds, peak
+
+
+def exponent(sizes, values) -> float:
+    """Least squares slope of log(value) over log(size), 1 for linear growth, 2 for quadratic."""
+
+    xs = [math.log(x) for x in sizes]
+    ys = [math.log(max(y, 1e-9)) for y in values]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sum((x - mx) ** 2 for x in xs)
+
+
+def run(dimension: str, sizes, case, threshold: float = 1.3) -> dict[str, float]:
+    """
+    Measure `case(size)` metrics for growing sizes, print the table and warn about metrics
+    growing worse than linear. Return growth exponent of every metric.
+    """
+
+    results = []
+    for n in sizes:
+        results.append(case(n))
+        drop_graphs()
+    exponents = {k: exponent(sizes, [x[k] for x in results]) for k in results[0]}
+
+    print()
+    print(f"{dimension:>16} " + " ".join(f"{k:>16}" for k in results[0]))
+    for n, x in zip(sizes, results):
+        print(f"{n:>16} " + " ".join(f"{v:>16.6g}" for v in x.values()))
+    print(f"{'exponent':>16} " + " ".join(f"{v:>16.2f}" for v in exponents.values()))
+
+    for k, v in exponents.items():
+        if v > threshold:
+            warnings.warn(f"{dimension}: {k} grows as n^{v:.2f}", stacklevel=2)
+
+    return exponents
+
+
+def graph_case(convert=True, rebuild=False, **graph_kwds):
+    def case(**size):
+        kwds = {**graph_kwds, **size}
+        views = kwds.pop("views", 1)
+
+        module = None
+
+        def build_models(_):
+            nonlocal module
+            module = make_graph(**kwds)
+            for model in module.models:
+                model.model_rebuild()
+
+        result = {}
+        result["models, s"], _ = measure(build_models, repeat=1)
+        result["views, s"], peak = measure(
+            lambda module: add_views(module, views), setup=lambda: make_graph(**kwds), repeat=1, memory=True
+        )
+        result["memory, KiB"] = peak / 1024
+        add_views(module, views)
+
+        if rebuild:
+            result["rebuild, s"], _ = measure(lambda _: [x.views_rebuild() for x in reversed(module.models)], repeat=1)
+
+        if convert:
+            obj = make_instance(module)
+            obj.V0()
+            result["convert, s"], _ = measure(lambda _: [obj.V0() for _ in range(100)])
+
+        return result
+
+    return case
+
+
+def test_scale_wide_models(scale=SCALE):
+    case = graph_case(models=1)
+    run("fields", [25 * scale, 50 * scale, 100 * scale, 200 * scale], lambda n: case(fields=n))
+
+
+def test_scale_deep_nesting(scale=SCALE):
+    case = graph_case(fields=4, nested=True)
+    run("depth", [5 * scale, 10 * scale, 20 * scale, 40 * scale], lambda n: case(models=n))
+
+
+def test_scale_many_views(scale=SCALE):
+    case = graph_case(models=1, fields=20)
+    run("views", [4 * scale, 8 * scale, 16 * scale, 32 * scale], lambda n: case(views=n))
+
+
+def test_scale_many_models(scale=SCALE):
+    case = graph_case(convert=False, rebuild=True, fields=4, refs=2, forward_refs=True)
+    run("models", [10 * scale, 20 * scale, 40 * scale], lambda n: case(models=n))
+
+
+def test_scale_update_type(scale=SCALE):
+    def case(n):
+        module = make_graph(models=n, fields=1)
+        add_views(module, 1)
+        tp = Optional[list[dict[str, Union[tuple(module.models)]]]]  # type: ignore
+        seconds, _ = measure(lambda _: [_update_type(tp, lambda model: model.V0) for _ in range(10)])
+        return {"update_type, s": seconds}
+
+    run("union size", [25 * scale, 50 * scale, 100 * scale, 200 * scale], case)
+
+
+def test_scale_reapply_base_views(scale=SCALE):
+    def case(n):
+        module = make_graph(models=1, fields=20)
+        add_views(module, n)
+
+        def reapply(_):
+            reapply_base_views(type("Child", (module.M0,), {"__module__": module.__name__, "__annotations__": {}}))
+
+        seconds, peak = measure(reapply, repeat=1, memory=True)
+        return {"reapply, s": seconds, "memory, KiB": peak / 1024}
+
+    run("views", [4 * scale, 8 * scale, 16 * scale, 32 * scale], case)
+
+
+if __name__ == "__main__":
+    # python -m tests.test_5_scale [scale], e.g. scale 25 for thousands of models
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else SCALE or 1
+    for test in (
+        test_scale_wide_models,
+        test_scale_deep_nesting,
+        test_scale_many_views,
+        test_scale_many_models,
+        test_scale_update_type,
+        test_scale_reapply_base_views,
+    ):
+        test(scale)